@@ -0,0 +1,58 @@
+"""
+Benchmark the on-disk response cache across repeated collection runs
+
+Runs the same collection three times against a local stub TMDB server:
+cold (empty cache), warm (fresh entries) and expired (entries revalidated
+with If-None-Match/304).
+
+Usage:
+    python -m benchmarks.bench_cache --pages 100 --latency 0.02
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_server import StubTMDBServer
+from scraper.cache import SQLiteResponseCache
+from scraper.data_collector import MovieDataCollector
+
+
+def run(pages: int, latency: float, workers: int):
+    with tempfile.TemporaryDirectory() as tmp, StubTMDBServer(latency=latency) as server:
+        path = os.path.join(tmp, "cache.db")
+        print(f"\nCollecting {pages} pages, {latency * 1000:.0f} ms server latency, {workers} workers")
+        print(f"{'run':>8} {'seconds':>9} {'requests':>9} {'304s':>6} {'hits':>6} {'misses':>7} {'revalid.':>9}")
+        
+        for label in ("cold", "warm", "expired"):
+            cache = SQLiteResponseCache(path)
+            if label == "expired":
+                cache.expire()
+            collector = MovieDataCollector("bench-key", workers=workers, requests_per_second=None,
+                                           base_url=server.base_url, cache=cache)
+            requests_before, not_modified_before = server.request_count, server.not_modified_count
+            
+            start = time.perf_counter()
+            collector.get_genres()
+            collector.get_popular_movies(pages=pages)
+            elapsed = time.perf_counter() - start
+            
+            stats = cache.stats
+            print(f"{label:>8} {elapsed:>9.2f} {server.request_count - requests_before:>9} "
+                  f"{server.not_modified_count - not_modified_before:>6} "
+                  f"{stats['hits']:>6} {stats['misses']:>7} {stats['revalidated']:>9}")
+            cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    run(args.pages, args.latency, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark concurrent page fetching against a local stub TMDB server
+
+Usage:
+    python -m benchmarks.bench_collector --pages 200 --latency 0.05
+"""
+import argparse
+import time
+
+from benchmarks.stub_server import StubTMDBServer
+from scraper.data_collector import MovieDataCollector
+
+
+def run(pages: int, latency: float, workers_list, requests_per_second: float):
+    with StubTMDBServer(latency=latency) as server:
+        print(f"\nFetching {pages} pages, {latency * 1000:.0f} ms server latency, "
+              f"rate limit {requests_per_second or 'off'} req/s")
+        print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+        
+        baseline = None
+        for workers in workers_list:
+            collector = MovieDataCollector("bench-key", workers=workers,
+                                           requests_per_second=requests_per_second,
+                                           base_url=server.base_url)
+            start = time.perf_counter()
+            movies = collector.get_popular_movies(pages=pages)
+            elapsed = time.perf_counter() - start
+            
+            assert [movie["id"] for movie in movies] == list(range(1, pages * 20 + 1)), "pages out of order"
+            
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {pages / elapsed:>9.1f} {baseline / elapsed:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub server latency in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--rps", type=float, default=0, help="Token bucket budget (0 disables pacing)")
+    args = parser.parse_args()
+    
+    run(args.pages, args.latency, args.workers, args.rps or None)
+
+
+if __name__ == "__main__":
+    main()
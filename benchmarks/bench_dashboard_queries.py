@@ -0,0 +1,90 @@
+"""
+Compare the dashboard's data queries with and without SQL-side aggregation
+
+The original dashboard loaded the whole movies table (SELECT *) once for
+the language pie and again for the scatter plot, then aggregated in pandas.
+This compares that with get_language_counts and the sampled get_scatter_data,
+reporting time and peak Python heap for each, and checks the language
+counts match.
+
+Usage:
+    python -m benchmarks.bench_dashboard_queries --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_store_movies import make_movies
+from storage.db_connector import DatabaseConnector
+
+
+def language_counts_in_pandas(db: DatabaseConnector, threshold: int = 3) -> pd.Series:
+    language_counts = db.get_movies()["original_language"].value_counts()
+    main_languages = language_counts[language_counts >= threshold]
+    other_languages = language_counts[language_counts < threshold].sum()
+    if other_languages > 0:
+        main_languages["Other"] = other_languages
+    return main_languages
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(rows: int, max_points: int):
+    movies = make_movies(rows).drop(columns=["genre_list"])
+    # A handful of rare languages so the "Other" bucket is exercised
+    rare = np.random.default_rng(1).choice(rows, 20, replace=False)
+    movies.loc[rare, "original_language"] = [f"x{position % 10}" for position in range(20)]
+    
+    with tempfile.TemporaryDirectory() as tmp, DatabaseConnector(os.path.join(tmp, "movies.db")) as db:
+        db.create_tables()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.store_movies(movies)
+        del movies
+        
+        cases = [
+            ("languages: SELECT * + pandas", lambda: language_counts_in_pandas(db)),
+            ("languages: SQL GROUP BY", lambda: db.get_language_counts(3)),
+            ("scatter: SELECT *", db.get_movies),
+            ("scatter: projected + sampled",
+             lambda: db.get_scatter_data(["popularity", "vote_average", "vote_count"], max_points)),
+        ]
+        
+        results = {}
+        print(f"\n{'query':>30} {'seconds':>9} {'peak MiB':>9} {'rows':>9}")
+        for label, func in cases:
+            result, elapsed, peak = measure(func)
+            results[label] = result
+            print(f"{label:>30} {elapsed:>9.3f} {peak / 2**20:>9.1f} {len(result):>9}")
+        
+        expected = results["languages: SELECT * + pandas"]
+        actual = results["languages: SQL GROUP BY"].set_index("original_language")["movie_count"]
+        assert expected.sort_index().to_dict() == actual.sort_index().to_dict(), "language counts differ"
+        print("Language counts match")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--max-points", type=int, default=5000, help="Scatter sample size")
+    args = parser.parse_args()
+    
+    run(args.rows, args.max_points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark small-query latency with and without pooled connections
+
+Compares opening a fresh sqlite3 connection per query (the original
+DatabaseConnector behaviour) with the pooled read-only connections.
+
+Usage:
+    python -m benchmarks.bench_db_reads --rows 1000 --queries 2000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_store_movies import make_movies
+from storage.db_connector import DatabaseConnector
+
+QUERY = """
+SELECT id, title, release_year, vote_average, vote_count, weighted_rating
+FROM movies
+ORDER BY weighted_rating DESC
+LIMIT 10
+"""
+
+
+def query_with_fresh_connection(db_path: str) -> pd.DataFrame:
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql(QUERY, conn)
+    conn.close()
+    return df
+
+
+def run(rows: int, queries: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "movies.db")
+        # Without the query cache, so every call really runs the query
+        with DatabaseConnector(db_path, cache_size=0) as db:
+            db.create_tables()
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.store_movies(make_movies(rows))
+            db.connections.close()
+            
+            print(f"{'mode':>18} {'us/query':>10}")
+            for label, func in (("fresh connection", lambda: query_with_fresh_connection(db_path)),
+                                ("pooled reader", lambda: db.get_top_rated_movies(10))):
+                func()  # Warm up
+                start = time.perf_counter()
+                for _ in range(queries):
+                    func()
+                elapsed = time.perf_counter() - start
+                print(f"{label:>18} {elapsed / queries * 1e6:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    
+    run(args.rows, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare the memory of the transformed movie frame with and without the dtype schema
+
+Builds the original frame (object strings, int64/float64 numbers) with the
+legacy per-movie loop and the compact one with DataTransformer.process_movies,
+which applies storage.dtypes.MOVIE_DTYPES, then reports memory per row for
+each column and in total. Object columns are measured like deep memory, but
+with every Python object counted once: rows of the compact frame share their
+genre_list objects, which deep memory would count once per row. The text
+columns only shrink with pyarrow installed (see requirements.txt), so the
+total is also shown without them. Finally stores the compact frame and checks
+get_movies reads back the same values and dtypes.
+
+Usage:
+    python -m benchmarks.bench_dtypes --rows 200000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_transformer import make_raw_movies, process_movies_legacy
+from benchmarks.stub_server import GENRES
+from processor.transformer import DataTransformer
+from storage.db_connector import DatabaseConnector
+from storage.dtypes import MOVIE_DTYPES, STRING_DTYPE
+
+TEXT_COLUMNS = [column for column, dtype in MOVIE_DTYPES.items() if dtype is STRING_DTYPE]
+
+
+def object_bytes(series: pd.Series) -> int:
+    """
+    Pointer array plus the size of each distinct object it points to
+    """
+    unique = {id(value): value for value in series.array}
+    return series.memory_usage(deep=False, index=False) + sum(value.__sizeof__() for value in unique.values())
+
+
+def bytes_per_row(df: pd.DataFrame) -> pd.Series:
+    usage = df.memory_usage(deep=True, index=False)
+    for column in df.columns:
+        if df[column].dtype == object:
+            usage[column] = object_bytes(df[column])
+    return usage / len(df)
+
+
+def check_round_trip(df: pd.DataFrame):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseConnector(os.path.join(tmp, "dtypes.db"))
+        db.create_tables()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.store_movies(df)
+        stored = db.get_movies().sort_values("id").reset_index(drop=True)
+        db.close()
+    
+    expected = df.drop(columns="genre_list").sort_values("id").reset_index(drop=True)
+    pd.testing.assert_frame_equal(expected, stored[expected.columns])
+    print("get_movies round-trips values and dtypes")
+
+
+def run(rows: int):
+    movies = make_raw_movies(rows)
+    
+    start = time.perf_counter()
+    legacy = process_movies_legacy(movies, GENRES)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    compact = DataTransformer().process_movies(movies, GENRES)
+    compact_seconds = time.perf_counter() - start
+    del movies
+    
+    before, after = bytes_per_row(legacy), bytes_per_row(compact)
+    print(f"\n{rows} movies, string dtype: {STRING_DTYPE if isinstance(STRING_DTYPE, str) else 'object (no pyarrow)'}")
+    print(f"{'column':>20} {'before B/row':>13} {'after B/row':>12} {'dtype':>16}")
+    for column in compact.columns:
+        print(f"{column:>20} {before[column]:>13.1f} {after[column]:>12.1f} {str(compact[column].dtype):>16}")
+    
+    other = [column for column in compact.columns if column not in TEXT_COLUMNS]
+    scalar = [column for column in other if column != "genre_list"]
+    for label, columns in (("total", list(compact.columns)), ("without text", other),
+                           ("without text, lists", scalar)):
+        print(f"{label:>20} {before[columns].sum():>13.1f} {after[columns].sum():>12.1f} "
+              f"{before[columns].sum() / after[columns].sum():>15.1f}x")
+    print(f"Transform: legacy {legacy_seconds:.2f}s, with schema {compact_seconds:.2f}s")
+    
+    check_round_trip(compact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
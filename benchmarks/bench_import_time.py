@@ -0,0 +1,107 @@
+"""
+Check the startup cost of the quick CLI commands against an import-time budget
+
+Runs each quick command (check, query, --help) in a fresh interpreter under
+`python -X importtime`, against an empty temporary database, and reports the
+total import time (excluding interpreter startup) and whether any heavy
+dependency (pandas, numpy, matplotlib, seaborn, requests, pyarrow) was
+loaded. Exits with status 1 if a command goes over the budget or loads a
+heavy dependency, so it can run as a CI check.
+
+Usage:
+    python -m benchmarks.bench_import_time --budget-ms 150
+"""
+import argparse
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ["check"],
+    ["query", "top", "--limit", "3"],
+    ["query", "sql", "SELECT COUNT(*) FROM movies"],
+    ["--help"],
+]
+
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "seaborn", "requests", "pyarrow")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(command, env):
+    """
+    Run main.py with a command under -X importtime
+    
+    Returns:
+        Tuple of (dictionary of top-level module name to cumulative import
+        microseconds, set of every module imported)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py")] + command,
+                            env=env, cwd=env["BENCH_DIR"], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"main.py {' '.join(command)} failed:\n{result.stdout}{result.stderr}")
+    
+    top_level, modules = {}, set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if match.group(3) == " ":  # One space of indent: imported directly, not as a dependency
+            top_level[match.group(4)] = int(match.group(2))
+    return top_level, modules
+
+
+def make_environment(directory: str) -> dict:
+    """
+    Create an empty database with the tables the quick commands read, and the environment to run main.py against it
+    """
+    db_path = os.path.join(directory, "movie_data.db")
+    conn = sqlite3.connect(db_path)
+    for table in ("movies (id INTEGER PRIMARY KEY, title TEXT)", "genres (id INTEGER PRIMARY KEY, name TEXT)",
+                  "movie_genres (movie_id INTEGER, genre_id INTEGER)",
+                  "summary_top_rated (id INTEGER PRIMARY KEY, title TEXT, release_year INTEGER, "
+                  "vote_average REAL, vote_count INTEGER, weighted_rating REAL)"):
+        conn.execute(f"CREATE TABLE {table}")
+    conn.close()
+    return dict(os.environ, DATABASE_URL=db_path, BENCH_DIR=directory, PYTHONPATH=ROOT)
+
+
+def run(budget_ms: float, repeat: int) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = make_environment(tmp)
+        
+        ok = True
+        print(f"\n{'command':>40} {'import ms':>10} {'heavy modules':>20}")
+        for command in COMMANDS:
+            # Best of a few runs, so a cold disk cache doesn't count against the budget
+            profiles = [import_profile(command, env) for _ in range(repeat)]
+            profile, modules = min(profiles, key=lambda result: sum(result[0].values()))
+            # site runs at interpreter startup for every command, so it isn't charged to the CLI
+            total_ms = sum(micros for module, micros in profile.items() if module != "site") / 1000
+            heavy = sorted(module for module in modules if module in HEAVY_MODULES)
+            over = total_ms > budget_ms or heavy
+            ok = ok and not over
+            print(f"{' '.join(command):>40} {total_ms:>10.1f} {', '.join(heavy) or '-':>20}"
+                  f"{'  OVER BUDGET' if over else ''}")
+        
+        print(f"Budget: {budget_ms:.0f} ms, no heavy modules -> {'OK' if ok else 'FAILED'}")
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=150, help="Import-time budget per command")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command (the fastest counts)")
+    args = parser.parse_args()
+    
+    sys.exit(0 if run(args.budget_ms, args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare a full reload with an incremental (delta) harvest
+
+Harvests a catalog from the local stub TMDB server, marks a fraction of the
+movies as changed, then runs the incremental collection (twice, changing the
+same movies again) and reports how many requests and rows each mode needed.
+Responses go through a SQLiteResponseCache like in a real run, so each
+incremental round also checks the changed movies' new vote counts were stored
+rather than served from a fresh cache entry.
+
+Usage:
+    python -m benchmarks.bench_incremental --pages 200 --changed 0.01
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.stub_server import StubTMDBServer, fake_details
+from main import HARVEST_SOURCE, collect_incremental
+from processor.transformer import DataTransformer
+from scraper.cache import SQLiteResponseCache
+from scraper.data_collector import MovieDataCollector
+from storage.db_connector import DatabaseConnector
+
+
+def run(pages: int, changed: float, workers: int, latency: float):
+    with tempfile.TemporaryDirectory() as tmp, StubTMDBServer(latency=latency, total_pages=pages) as server:
+        db = DatabaseConnector(os.path.join(tmp, "movies.db"))
+        db.create_tables()
+        cache = SQLiteResponseCache(os.path.join(tmp, "responses.db"))
+        collector = MovieDataCollector("bench-key", workers=workers, requests_per_second=None,
+                                       base_url=server.base_url, cache=cache)
+        transformer = DataTransformer()
+        genres = collector.get_genres()
+        
+        print(f"\n{'mode':>12} {'seconds':>9} {'requests':>9} {'rows':>7}")
+        changed_ids = list(range(1, pages * 20 + 1, max(1, int(1 / changed))))
+        for mode in ("full", "incremental", "incremental"):
+            if mode == "incremental":
+                server.mark_changed(changed_ids)
+            
+            requests_before = server.request_count
+            start = time.perf_counter()
+            run_started_at = datetime.now(timezone.utc)
+            
+            if mode == "full":
+                raw_movies = collector.get_popular_movies(pages=pages)
+            else:
+                # New arrivals are only expected near the top of the popular list
+                raw_movies = collect_incremental(collector, db, pages=1)
+            movies_df = transformer.process_movies(raw_movies, genres, vote_mean=db.get_vote_mean())
+            db.upsert_movies(movies_df)
+            db.save_watermark(HARVEST_SOURCE, run_started_at, pages, movies_df["id"].tolist())
+            
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>12} {elapsed:>9.2f} {server.request_count - requests_before:>9} {len(movies_df):>7}")
+
+            if mode == "incremental":
+                stored = db.get_movies().set_index("id")["vote_count"]
+                stale = [movie_id for movie_id in changed_ids
+                         if stored[movie_id] != fake_details(movie_id)["vote_count"] + server.revisions[movie_id]]
+                assert not stale, f"{len(stale)} changed movies kept their old vote count, e.g. {stale[:5]}"
+        cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of the catalog marked as changed")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub server latency in seconds")
+    args = parser.parse_args()
+    
+    run(args.pages, args.changed, args.workers, args.latency)
+
+
+if __name__ == "__main__":
+    main()
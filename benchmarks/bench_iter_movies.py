@@ -0,0 +1,114 @@
+"""
+Compare ways of walking the movies table in Python
+
+Loads the table with get_movies() and walks the DataFrame's rows, builds
+plain __dict__ objects from a fetchall(), and streams slotted Movie records
+with iter_movies(), for a full row and for a projection of the required id
+and title plus the two summed columns. Each
+case sums weighted_rating per release year; the time, peak Python heap and
+totals are reported, and the totals are checked to match.
+
+Usage:
+    python -m benchmarks.bench_iter_movies --rows 500000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import pandas as pd
+
+from benchmarks.bench_store_movies import make_movies
+from storage.db_connector import DatabaseConnector
+
+
+class DictMovie:
+    """
+    The original storage.models.Movie shape: one __dict__ per instance
+    """
+    
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def totals_from_records(records) -> dict:
+    totals = defaultdict(float)
+    for movie in records:
+        if movie.release_year is not None and movie.weighted_rating is not None:
+            totals[int(movie.release_year)] += movie.weighted_rating
+    return totals
+
+
+def totals_from_dataframe(db: DatabaseConnector) -> dict:
+    return totals_from_records(
+        row for row in db.get_movies().itertuples(index=False) if row.release_year is not pd.NA
+    )
+
+
+def totals_from_dict_objects(db_path: str) -> dict:
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute("SELECT * FROM movies ORDER BY id")
+    columns = [column[0] for column in cursor.description]
+    movies = [DictMovie(**dict(zip(columns, row))) for row in cursor.fetchall()]
+    conn.close()
+    return totals_from_records(movies)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(rows: int, batch_size: int):
+    movies = make_movies(rows).drop(columns=["genre_list"])
+    
+    with tempfile.TemporaryDirectory() as tmp, DatabaseConnector(os.path.join(tmp, "movies.db")) as db:
+        db.create_tables()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.store_movies(movies)
+        del movies
+        
+        cases = [
+            ("get_movies + itertuples", lambda: totals_from_dataframe(db)),
+            ("fetchall + __dict__ objects", lambda: totals_from_dict_objects(db.db_path)),
+            ("iter_movies (all columns)", lambda: totals_from_records(db.iter_movies(batch_size=batch_size))),
+            ("iter_movies (4 columns)", lambda: totals_from_records(
+                db.iter_movies(["id", "title", "release_year", "weighted_rating"], batch_size=batch_size))),
+        ]
+        
+        results = {}
+        print(f"\n{'case':>30} {'seconds':>9} {'peak MiB':>9}")
+        for label, func in cases:
+            result, elapsed, peak = measure(func)
+            results[label] = result
+            print(f"{label:>30} {elapsed:>9.3f} {peak / 2**20:>9.1f}")
+        
+        expected = results["get_movies + itertuples"]
+        for label, totals in results.items():
+            assert totals.keys() == expected.keys(), f"{label}: years differ"
+            assert all(abs(totals[year] - expected[year]) < 1e-6 * max(1.0, abs(expected[year]))
+                       for year in expected), f"{label}: totals differ"
+        print("Totals match")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows fetched per round trip by iter_movies")
+    args = parser.parse_args()
+    
+    run(args.rows, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
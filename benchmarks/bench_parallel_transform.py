@@ -0,0 +1,57 @@
+"""
+Scale the transform + enrich chain across worker processes
+
+Runs ParallelTransformer over the same synthetic catalog with an increasing
+number of workers, checks every result against the single-process chain
+(including the reconciled weighted rating) and reports rows/sec and the
+speedup over one worker. Speedup is bounded by the cores available, and
+ParallelTransformer caps its pool at that many workers ("used").
+
+Usage:
+    python -m benchmarks.bench_parallel_transform --rows 500000 --workers 1 2 4 8
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.stub_server import GENRES, fake_movie
+from processor.parallel import ParallelTransformer, _available_cpus
+
+
+def run(rows: int, worker_counts, enrich: bool):
+    movies = [fake_movie(movie_id) for movie_id in range(1, rows + 1)]
+    cpus = _available_cpus()
+    print(f"\n{rows} movies, enrich={enrich}, {cpus} CPUs available")
+    if max(worker_counts) > cpus:
+        print(f"Worker counts above {cpus} are capped; run on a host with at least {max(worker_counts)} CPUs "
+              f"to measure their scaling")
+    print(f"{'workers':>8} {'used':>5} {'seconds':>9} {'rows/s':>10} {'speedup':>8}")
+    
+    baseline, baseline_seconds = None, None
+    for workers in worker_counts:
+        transformer = ParallelTransformer(workers, enrich=enrich)
+        start = time.perf_counter()
+        df = transformer.process_movies(movies, GENRES)
+        elapsed = time.perf_counter() - start
+        
+        if baseline is None:
+            baseline, baseline_seconds = df, elapsed
+        else:
+            pd.testing.assert_frame_equal(baseline, df, check_exact=False, rtol=1e-12)
+        print(f"{workers:>8} {transformer.workers:>5} {elapsed:>9.2f} {rows / elapsed:>10,.0f} "
+              f"{baseline_seconds / elapsed:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--no-enrich", action="store_true", help="Benchmark the transform stage alone")
+    args = parser.parse_args()
+    
+    run(args.rows, args.workers, not args.no_enrich)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark repeated report and dashboard reads with and without the query cache
+
+Loads a synthetic catalog, then times the report queries (top rated,
+movies by year, genre stats, language counts) and get_movies several ways:
+with the cache disabled, on a cold cache, on a warm in-memory cache, and
+from the on-disk cache in a fresh connector, as a new report process would
+see it. Then checks that an upsert through DatabaseConnector and a write
+from another connection both invalidate the cached results.
+
+Usage:
+    python -m benchmarks.bench_query_cache --rows 200000 --repeat 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.bench_store_movies import make_movies
+from storage.db_connector import DatabaseConnector
+
+REPORT_CALLS = [
+    ("top rated", lambda db: db.get_top_rated_movies(10)),
+    ("top rated (from movies)", lambda db: db.get_top_rated_movies(500)),
+    ("movies by year", lambda db: db.get_movies_by_year()),
+    ("genre stats", lambda db: db.get_genre_stats()),
+    ("language counts", lambda db: db.get_language_counts()),
+    ("get_movies", lambda db: db.get_movies()),
+]
+
+
+def time_call(func, db: DatabaseConnector, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(db)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def check_invalidation(db_path: str, cache_path: str):
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        before = db.get_top_rated_movies(500)
+        
+        # A write through DatabaseConnector bumps the stored write version
+        updated = before.head(1).assign(weighted_rating=before["weighted_rating"].iloc[0] + 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.upsert_movies(updated)
+        assert db.get_top_rated_movies(500)["weighted_rating"].iloc[0] == updated["weighted_rating"].iloc[0], \
+            "cached result survived an upsert"
+        
+        # A write from another connection only moves PRAGMA data_version
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE movies SET weighted_rating = 100 WHERE id = ?", (int(before["id"].iloc[-1]),))
+        conn.commit()
+        conn.close()
+        assert db.get_top_rated_movies(500)["weighted_rating"].iloc[0] == 100, \
+            "cached result survived an outside write"
+    print("Writes invalidate cached results")
+
+
+def run(rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "movies.db")
+        cache_path = os.path.join(tmp, "query_cache.db")
+        with DatabaseConnector(db_path) as db:
+            db.create_tables()
+            with contextlib.redirect_stdout(io.StringIO()):
+                db.store_movies(make_movies(rows))
+        
+        uncached = DatabaseConnector(db_path, cache_size=0)
+        cached = DatabaseConnector(db_path, cache_path=cache_path)
+        
+        print(f"\n{rows} movies, microseconds per call")
+        print(f"{'call':>24} {'no cache':>10} {'cold':>10} {'memory':>10} {'disk':>10}")
+        for label, func in REPORT_CALLS:
+            # get_movies copies the whole table on every call, so give it fewer rounds
+            rounds = max(1, repeat // 50) if label == "get_movies" else repeat
+            no_cache = time_call(func, uncached, rounds)
+            cold = time_call(func, cached, 1)
+            memory = time_call(func, cached, rounds)
+            with DatabaseConnector(db_path, cache_path=cache_path) as fresh:
+                disk = time_call(func, fresh, 1)
+            print(f"{label:>24} {no_cache:>10.0f} {cold:>10.0f} {memory:>10.0f} {disk:>10.0f}")
+        
+        print(f"Cache: {cached.query_cache.stats}")
+        uncached.close()
+        cached.close()
+        
+        check_invalidation(db_path, cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per timing")
+    args = parser.parse_args()
+    
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
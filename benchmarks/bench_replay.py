@@ -0,0 +1,79 @@
+"""
+Compare re-processing a harvest by fetching it again with replaying it from the landing zone
+
+Harvests popular pages and movie details from the local stub TMDB server
+(with per-request latency and the configured request rate) into a landing
+zone, then rebuilds the movie tables twice: once by fetching everything
+again and once from the landed files only. Prints wall time and requests
+for each, plus the size of the landing zone.
+
+Usage:
+    python -m benchmarks.bench_replay --pages 200 --details 1000 --rate 40
+"""
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.stub_server import StubTMDBServer
+from main import replay
+from processor.transformer import DataTransformer
+from scraper.data_collector import MovieDataCollector
+from storage.db_connector import DatabaseConnector
+from storage.landing import LandingZone
+
+
+def refetch(collector: MovieDataCollector, db: DatabaseConnector, pages: int, details: int) -> int:
+    transformer = DataTransformer()
+    genres = collector.get_genres()
+    movies_df = transformer.process_movies(collector.get_popular_movies(pages), genres)
+    db.store_genres(genres)
+    db.store_movies(movies_df)
+    details_iter = collector.iter_movies_with_details(movies_df["id"].tolist()[:details])
+    db.store_movie_details(transformer.process_movie_details(details_iter))
+    return len(movies_df)
+
+
+def run(pages: int, details: int, workers: int, rate: float, latency: float):
+    with tempfile.TemporaryDirectory() as tmp, StubTMDBServer(latency=latency, total_pages=pages) as server:
+        landing = LandingZone(os.path.join(tmp, "landing"))
+        collector = MovieDataCollector("bench-key", workers=workers, landing=landing,
+                                       requests_per_second=rate, base_url=server.base_url)
+        
+        print(f"\n{'mode':>8} {'seconds':>9} {'requests':>9} {'movies':>7}")
+        for mode in ("fetch", "replay"):
+            db = DatabaseConnector(os.path.join(tmp, f"{mode}.db"))
+            db.create_tables()
+            requests_before = server.request_count
+            start = time.perf_counter()
+            
+            if mode == "fetch":
+                movies = refetch(collector, db, pages, details)
+                landing.close()
+            else:
+                movies = replay(db, landing, SimpleNamespace(since=None, until=None, transform_workers=1))
+            
+            elapsed = time.perf_counter() - start
+            print(f"{mode:>8} {elapsed:>9.2f} {server.request_count - requests_before:>9} {movies:>7}")
+            db.close()
+        
+        landed = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(landing.root) for name in names)
+        print(f"\nLanding zone: {landed / 2 ** 20:.1f} MiB as {landing.file_format}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--details", type=int, default=1000, help="Movies to fetch details for")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=40, help="API requests per second")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency in seconds")
+    args = parser.parse_args()
+    
+    run(args.pages, args.details, args.workers, args.rate, args.latency)
+
+
+if __name__ == "__main__":
+    main()
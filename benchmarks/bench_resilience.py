@@ -0,0 +1,72 @@
+"""
+Harvest from a flaky, throttling stub server with and without the resilient transport
+
+The stub fails a fraction of requests with 5xx errors and answers 429 (with
+Retry-After) whenever more requests are in flight than it allows. Each mode
+fetches the same popular pages and movie details and reports whether the
+run finished, how long it took and how many requests were throttled,
+failed or retried.
+
+Usage:
+    python -m benchmarks.bench_resilience --pages 50 --details 500 --workers 16 --server-concurrency 6
+"""
+import argparse
+import time
+
+import requests
+
+from benchmarks.stub_server import StubTMDBServer
+from monitoring.metrics import metrics
+from scraper.data_collector import MovieDataCollector
+from scraper.transport import RetryPolicy
+
+MODES = [
+    ("no retries", dict(retry=RetryPolicy(max_retries=0), adaptive_concurrency=False)),
+    ("retries", dict(retry=RetryPolicy(seed=0), adaptive_concurrency=False)),
+    ("retries + AIMD", dict(retry=RetryPolicy(seed=0), adaptive_concurrency=True)),
+]
+
+
+def harvest(collector: MovieDataCollector, pages: int, details: int) -> int:
+    movies = sum(len(results) for results in collector.iter_popular_pages(pages))
+    movies += sum(1 for _ in collector.iter_movies_with_details(range(1, details + 1)))
+    return movies
+
+
+def run(pages: int, details: int, workers: int, error_rate: float, server_concurrency: int, latency: float):
+    print(f"\n{'mode':>16} {'outcome':>10} {'seconds':>8} {'movies':>7} {'requests':>9} "
+          f"{'429s':>6} {'5xx':>5} {'retries':>8}")
+    for label, options in MODES:
+        metrics.reset()
+        with StubTMDBServer(latency=latency, total_pages=pages, error_rate=error_rate,
+                            max_concurrency=server_concurrency) as server:
+            collector = MovieDataCollector("bench-key", workers=workers, requests_per_second=None,
+                                           base_url=server.base_url, **options)
+            start = time.perf_counter()
+            try:
+                movies, outcome = harvest(collector, pages, details), "ok"
+            except requests.HTTPError as error:
+                movies, outcome = 0, f"HTTP {error.response.status_code}"
+            elapsed = time.perf_counter() - start
+            
+            retries = sum(value for (name, _), value in metrics.counters.items() if name == "http_retries")
+            print(f"{label:>16} {outcome:>10} {elapsed:>8.2f} {movies:>7} {server.request_count:>9} "
+                  f"{server.throttled_count:>6} {server.error_count:>5} {int(retries):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--details", type=int, default=500, help="Movie details fetched after the pages")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of requests failed with a 5xx")
+    parser.add_argument("--server-concurrency", type=int, default=6,
+                        help="Requests in flight the stub allows before answering 429")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub server latency in seconds")
+    args = parser.parse_args()
+    
+    run(args.pages, args.details, args.workers, args.error_rate, args.server_concurrency, args.latency)
+
+
+if __name__ == "__main__":
+    main()
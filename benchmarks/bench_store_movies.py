@@ -0,0 +1,108 @@
+"""
+Benchmark bulk loading into the movies table
+
+Compares the original pandas to_sql(if_exists="replace") path with the
+chunked executemany upsert used by DatabaseConnector.store_movies and
+upsert_movies.
+
+Usage:
+    python -m benchmarks.bench_store_movies --sizes 10000 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from storage.db_connector import DatabaseConnector
+
+
+def make_movies(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic DataFrame shaped like DataTransformer.process_movies output
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, rows + 1)
+    release_date = pd.to_datetime("1970-01-01") + pd.to_timedelta(rng.integers(0, 20000, rows), unit="D")
+    release_date = pd.Series(release_date).mask(rng.random(rows) < 0.02)
+    titles = pd.Series(ids).map("Movie {}".format)
+    genre_names = np.array(["Action", "Comedy", "Drama", "Horror", "Romance"])
+    genre_list = [list(genre_names[rng.integers(0, 5, 2)]) for _ in range(rows)]
+    
+    vote_count = rng.integers(0, 10000, rows)
+    vote_average = rng.random(rows) * 10
+    return pd.DataFrame({
+        "id": ids,
+        "title": titles,
+        "original_title": titles,
+        "overview": titles + " overview text that is a little longer than the title.",
+        "popularity": rng.random(rows) * 1000,
+        "vote_average": vote_average,
+        "vote_count": vote_count,
+        "release_date": release_date,
+        "release_year": release_date.dt.year,
+        "genres": [", ".join(genres) for genres in genre_list],
+        "genre_list": genre_list,
+        "adult": False,
+        "poster_path": "/poster.jpg",
+        "backdrop_path": None,
+        "original_language": rng.choice(["en", "fr", "es", "ja"], rows),
+        "has_english_title": True,
+        "title_length": titles.str.len(),
+        "overview_length": titles.str.len() + 55,
+        "weighted_rating": vote_count / (vote_count + 100) * vote_average + 100 / (vote_count + 100) * 5.0,
+    })
+
+
+def store_with_to_sql(db_path: str, movies_df: pd.DataFrame):
+    """
+    The original store_movies implementation
+    """
+    df_to_store = movies_df.copy()
+    df_to_store["release_date"] = df_to_store["release_date"].astype(str)
+    df_to_store = df_to_store.drop(columns=["genre_list"])
+    conn = sqlite3.connect(db_path)
+    df_to_store.to_sql("movies", conn, if_exists="replace", index=False)
+    conn.close()
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args)
+    return time.perf_counter() - start
+
+
+def run(sizes, chunk_size: int):
+    print(f"{'rows':>9} {'to_sql replace':>16} {'store_movies':>14} {'upsert (update)':>17} {'speedup':>8}")
+    
+    for rows in sizes:
+        movies_df = make_movies(rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = timed(store_with_to_sql, os.path.join(tmp, "legacy.db"), movies_df)
+            
+            db = DatabaseConnector(os.path.join(tmp, "bulk.db"), chunk_size=chunk_size)
+            db.create_tables()
+            bulk = timed(db.store_movies, movies_df)
+            upsert = timed(db.upsert_movies, movies_df)
+        
+        print(f"{rows:>9} {rows / legacy:>12,.0f} r/s {rows / bulk:>10,.0f} r/s "
+              f"{rows / upsert:>13,.0f} r/s {legacy / bulk:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+    
+    run(args.sizes, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
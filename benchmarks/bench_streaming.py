@@ -0,0 +1,76 @@
+"""
+Compare peak memory of the in-memory pipeline with the chunked streaming pipeline
+
+Harvests the same catalog from the local stub TMDB server twice, once
+collecting everything before transforming and storing, once streaming
+fixed-size chunks through transform and load, and reports the peak
+Python heap (tracemalloc) of each mode.
+
+Usage:
+    python -m benchmarks.bench_streaming --pages 500 --chunk-size 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stub_server import StubTMDBServer
+from processor.transformer import DataTransformer
+from scraper.data_collector import MovieDataCollector
+from storage.db_connector import DatabaseConnector
+
+
+def load_in_memory(collector: MovieDataCollector, db: DatabaseConnector, genres, pages: int, chunk_size: int) -> int:
+    movies_df = DataTransformer().process_movies(collector.get_popular_movies(pages=pages), genres)
+    db.store_movies(movies_df)
+    return len(movies_df)
+
+
+def load_streaming(collector: MovieDataCollector, db: DatabaseConnector, genres, pages: int, chunk_size: int) -> int:
+    stored = 0
+    for movies_df in DataTransformer().iter_process_movies(collector.iter_popular_pages(pages), genres,
+                                                           chunk_size=chunk_size):
+        db.upsert_movies(movies_df)
+        stored += len(movies_df)
+    db.refresh_weighted_ratings(DataTransformer.MIN_VOTES)
+    return stored
+
+
+def run(pages: int, chunk_size: int, workers: int):
+    with tempfile.TemporaryDirectory() as tmp, StubTMDBServer(total_pages=pages) as server:
+        collector = MovieDataCollector("bench-key", workers=workers, requests_per_second=None,
+                                       base_url=server.base_url)
+        genres = collector.get_genres()
+        
+        results = []
+        for mode, load in (("in-memory", load_in_memory), ("streaming", load_streaming)):
+            db = DatabaseConnector(os.path.join(tmp, f"{mode}.db"))
+            db.create_tables()
+            
+            tracemalloc.start()
+            start = time.perf_counter()
+            rows = load(collector, db, genres, pages, chunk_size)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            db.close()
+            results.append((mode, rows, elapsed, peak))
+        
+        print(f"\n{'mode':>10} {'rows':>8} {'seconds':>9} {'peak MiB':>9}")
+        for mode, rows, elapsed, peak in results:
+            print(f"{mode:>10} {rows:>8} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Movies per chunk in streaming mode")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    
+    run(args.pages, args.chunk_size, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark DataTransformer.process_movies against the original row-by-row loop
+
+Checks that both produce the same frame, then reports throughput for
+list-of-dict records and for the column lists the harvest actually passes
+(as gathered page by page by MovieDataCollector.get_popular_movie_columns).
+
+Usage:
+    python -m benchmarks.bench_transformer --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.stub_server import GENRES, fake_movie
+from processor.transformer import DataTransformer
+
+
+def process_movies_legacy(movies: List[Dict], genres: List[Dict]) -> pd.DataFrame:
+    """
+    The original per-movie loop, kept as the parity and speed baseline
+    """
+    genre_lookup = {genre["id"]: genre["name"] for genre in genres}
+    processed_data = []
+    
+    for movie in movies:
+        genre_ids = movie.get("genre_ids") or [genre["id"] for genre in movie.get("genres") or []]
+        genre_names = [genre_lookup.get(genre_id, "Unknown") for genre_id in genre_ids]
+        
+        release_date = None
+        try:
+            if movie.get("release_date"):
+                release_date = datetime.strptime(movie["release_date"], "%Y-%m-%d")
+        except ValueError:
+            pass
+        
+        processed_data.append({
+            "id": movie.get("id"),
+            "title": movie.get("title"),
+            "original_title": movie.get("original_title"),
+            "overview": movie.get("overview"),
+            "popularity": movie.get("popularity"),
+            "vote_average": movie.get("vote_average"),
+            "vote_count": movie.get("vote_count"),
+            "release_date": release_date,
+            "release_year": release_date.year if release_date else None,
+            "genres": ", ".join(genre_names),
+            "genre_list": genre_names,
+            "adult": movie.get("adult", False),
+            "poster_path": movie.get("poster_path"),
+            "backdrop_path": movie.get("backdrop_path"),
+            "original_language": movie.get("original_language")
+        })
+    
+    cleaned_df = pd.DataFrame(processed_data, columns=DataTransformer.COLUMNS).copy()
+    cleaned_df["overview"] = cleaned_df["overview"].fillna("")
+    cleaned_df["vote_average"] = cleaned_df["vote_average"].fillna(0)
+    cleaned_df["vote_count"] = cleaned_df["vote_count"].fillna(0)
+    cleaned_df["popularity"] = cleaned_df["popularity"].fillna(0)
+    cleaned_df["has_english_title"] = cleaned_df["title"] == cleaned_df["original_title"]
+    cleaned_df["title_length"] = cleaned_df["title"].str.len()
+    cleaned_df["overview_length"] = cleaned_df["overview"].str.len()
+    m = 100
+    C = cleaned_df["vote_average"].mean()
+    cleaned_df["weighted_rating"] = (
+        (cleaned_df["vote_count"] / (cleaned_df["vote_count"] + m)) * cleaned_df["vote_average"] +
+        (m / (cleaned_df["vote_count"] + m)) * C
+    )
+    return cleaned_df
+
+
+def make_raw_movies(rows: int) -> List[Dict]:
+    """
+    Build raw TMDB records, including the awkward cases the transform must handle
+    """
+    movies = [fake_movie(movie_id) for movie_id in range(1, rows + 1)]
+    for index, movie in enumerate(movies):
+        if index % 101 == 0:
+            movie["release_date"] = "2020-02-30"  # Invalid date
+        if index % 103 == 0:
+            movie["genre_ids"] = [movie["genre_ids"][0], 999999]  # Unknown genre
+        if index % 107 == 0:
+            movie["genres"] = [{"id": genre_id, "name": "?"} for genre_id in movie.pop("genre_ids")]  # Details shape
+        if index % 109 == 0:
+            movie["genre_ids"] = []
+        if index % 113 == 0:
+            del movie["adult"]
+            movie["overview"] = None
+    return movies
+
+
+def assert_parity(expected: pd.DataFrame, actual: pd.DataFrame):
+    assert list(expected.columns) == list(actual.columns), (list(expected.columns), list(actual.columns))
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_categorical=False)
+
+
+def run(sizes: List[int]):
+    transformer = DataTransformer()
+    print(f"{'rows':>9} {'legacy':>9} {'records':>9} {'speedup':>8} {'columns':>9} {'speedup':>8}")
+    
+    for rows in sizes:
+        movies = make_raw_movies(rows)
+        columnar = {field: [movie.get(field) for movie in movies] for field in DataTransformer.RAW_FIELDS}
+        
+        start = time.perf_counter()
+        expected = process_movies_legacy(movies, GENRES)
+        legacy = time.perf_counter() - start
+        
+        timings = []
+        for raw in (movies, columnar):
+            start = time.perf_counter()
+            actual = transformer.process_movies(raw, GENRES)
+            timings.append(time.perf_counter() - start)
+            assert_parity(expected, actual)
+        
+        records, columns = timings
+        print(f"{rows:>9} {legacy:>8.2f}s {records:>8.2f}s {legacy / records:>7.1f}x "
+              f"{columns:>8.2f}s {legacy / columns:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
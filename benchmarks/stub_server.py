@@ -0,0 +1,258 @@
+"""
+Local stub of the TMDB API used by the benchmarks
+
+Serves deterministic fake data over HTTP so benchmarks exercise the real
+requests/urllib3 stack without touching the network or using API quota.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+GENRES = [
+    {"id": 28, "name": "Action"},
+    {"id": 12, "name": "Adventure"},
+    {"id": 16, "name": "Animation"},
+    {"id": 35, "name": "Comedy"},
+    {"id": 80, "name": "Crime"},
+    {"id": 18, "name": "Drama"},
+    {"id": 14, "name": "Fantasy"},
+    {"id": 27, "name": "Horror"},
+    {"id": 10749, "name": "Romance"},
+    {"id": 878, "name": "Science Fiction"},
+]
+LANGUAGES = ["en", "en", "en", "fr", "es", "ja", "ko", "de", "it", "hi", "sv"]
+RESULTS_PER_PAGE = 20
+
+
+def fake_movie(movie_id: int) -> Dict:
+    """
+    Build a deterministic fake movie record shaped like a TMDB list result
+    """
+    year = 1970 + movie_id % 55
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}" + (" 2" if movie_id % 7 == 0 else ""),
+        "original_title": f"Movie {movie_id}",
+        "overview": f"Overview for movie {movie_id}." * (1 + movie_id % 3),
+        "popularity": round(1000.0 / (1 + movie_id % 97), 3),
+        "vote_average": round((movie_id * 37) % 100 / 10, 1),
+        "vote_count": (movie_id * 131) % 5000,
+        "release_date": f"{year}-{1 + movie_id % 12:02d}-{1 + movie_id % 28:02d}" if movie_id % 50 else "",
+        "genre_ids": [GENRES[movie_id % len(GENRES)]["id"], GENRES[(movie_id // 3) % len(GENRES)]["id"]],
+        "adult": False,
+        "poster_path": f"/poster{movie_id}.jpg",
+        "backdrop_path": None,
+        "original_language": LANGUAGES[movie_id % len(LANGUAGES)],
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+    
+    def do_GET(self):
+        server = self.server.stub
+        parsed = urlparse(self.path)
+        path = parsed.path[len("/3"):] if parsed.path.startswith("/3") else parsed.path
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        
+        with server.lock:
+            server.request_count += 1
+            server.in_flight += 1
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+            
+            fault = server.inject_fault()
+            if fault is not None:
+                self._send_json(*fault)
+                return
+            
+            status, payload = server.route(path, params)
+            self._send_json(status, payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+    
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        headers = dict(headers or {})
+        
+        if status == 200 and self.server.stub.etags:
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                with self.server.stub.lock:
+                    self.server.stub.not_modified_count += 1
+                status, body = 304, b""
+        
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubTMDBServer:
+    """
+    Threaded HTTP server imitating the TMDB endpoints used by the scraper
+    
+    Usage:
+        with StubTMDBServer(latency=0.05) as server:
+            api = TMDBApi("key", base_url=server.base_url)
+    """
+    
+    def __init__(self, latency: float = 0.0, total_pages: int = 500, etags: bool = True,
+                 error_rate: float = 0.0, max_concurrency: Optional[int] = None,
+                 retry_after: Optional[int] = 1, seed: int = 0):
+        """
+        Args:
+            latency: Artificial per-request latency in seconds
+            total_pages: Number of popular pages the stub reports
+            etags: Send ETags and answer matching If-None-Match with 304
+            error_rate: Fraction of requests answered with a random 500/502/503
+            max_concurrency: Requests beyond this many in flight get a 429
+            retry_after: Retry-After seconds sent with 429s (None omits the header)
+            seed: Seed for the injected faults
+        """
+        self.latency = latency
+        self.total_pages = total_pages
+        self.etags = etags
+        self.error_rate = error_rate
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+        self.changed_ids: List[int] = []  # Reported by /movie/changes, see mark_changed
+        self.revisions: Dict[int, int] = {}  # Times each movie changed, added to its vote count
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.throttled_count = 0
+        self.error_count = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/3"
+    
+    def mark_changed(self, movie_ids: List[int]):
+        """
+        Change the given movies: /movie/changes reports them and their vote count goes up by one
+        """
+        with self.lock:
+            for movie_id in movie_ids:
+                if movie_id not in self.revisions:
+                    self.changed_ids.append(movie_id)
+                self.revisions[movie_id] = self.revisions.get(movie_id, 0) + 1
+    
+    def inject_fault(self) -> Optional[tuple]:
+        """
+        Decide whether to fail the current request
+        
+        Returns:
+            (status, payload, headers) for a throttled or failed request, or None to serve it
+        """
+        with self.lock:
+            if self.max_concurrency is not None and self.in_flight > self.max_concurrency:
+                self.throttled_count += 1
+                headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+                return 429, {"status_code": 25, "status_message": "Your request count is over the allowed limit."}, headers
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.error_count += 1
+                return self._random.choice((500, 502, 503)), {"status_message": "Injected failure"}, {}
+        return None
+    
+    def route(self, path: str, params: Dict[str, str]):
+        """
+        Resolve a request path to a (status, payload) pair
+        """
+        if path == "/genre/movie/list":
+            return 200, {"genres": GENRES}
+        
+        if path == "/movie/changes":
+            # Like TMDB, refuse ranges longer than 14 days, both ends included (end_date defaults to today)
+            try:
+                start = date.fromisoformat(params["start_date"]) if "start_date" in params else None
+                end = date.fromisoformat(params["end_date"]) if "end_date" in params else date.today()
+            except ValueError:
+                return 422, {"status_message": "Invalid date format."}
+            if start is not None and (end - start).days + 1 > 14:
+                return 422, {"status_message": "Invalid date range: should be a range no longer than 14 days."}
+            page = int(params.get("page", 1))
+            ids = self.changed_ids[(page - 1) * 100:page * 100]
+            total_pages = max(1, -(-len(self.changed_ids) // 100))
+            return 200, {"page": page, "results": [{"id": movie_id, "adult": False} for movie_id in ids],
+                         "total_pages": total_pages, "total_results": len(self.changed_ids)}
+        
+        if path == "/movie/popular":
+            page = int(params.get("page", 1))
+            first_id = (page - 1) * RESULTS_PER_PAGE + 1
+            results = [fake_movie(movie_id) for movie_id in range(first_id, first_id + RESULTS_PER_PAGE)]
+            return 200, {"page": page, "results": results,
+                         "total_pages": self.total_pages,
+                         "total_results": self.total_pages * RESULTS_PER_PAGE}
+        
+        parts = path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] == "movie" and parts[1].isdigit():
+            movie_id = int(parts[1])
+            if len(parts) == 3 and parts[2] == "credits":
+                return 200, fake_credits(movie_id)
+            if len(parts) == 2:
+                details = fake_details(movie_id)
+                details["vote_count"] += self.revisions.get(movie_id, 0)
+                if "credits" in params.get("append_to_response", "").split(","):
+                    details["credits"] = fake_credits(movie_id)
+                return 200, details
+        
+        return 404, {"status_code": 34, "status_message": "The resource you requested could not be found."}
+    
+    def start(self) -> "StubTMDBServer":
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def __enter__(self) -> "StubTMDBServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def fake_details(movie_id: int) -> Dict:
+    """
+    Build a deterministic fake /movie/{id} response
+    """
+    movie = fake_movie(movie_id)
+    genre_ids = movie.pop("genre_ids")
+    movie["genres"] = [genre for genre in GENRES if genre["id"] in genre_ids]
+    movie["runtime"] = 80 + movie_id % 70
+    movie["budget"] = (movie_id % 200) * 1_000_000
+    movie["revenue"] = (movie_id % 300) * 1_500_000
+    return movie
+
+
+def fake_credits(movie_id: int) -> Dict:
+    """
+    Build a deterministic fake /movie/{id}/credits response
+    """
+    cast = [{"id": movie_id * 10 + i, "name": f"Actor {movie_id * 10 + i}", "order": i} for i in range(5)]
+    crew = [{"id": movie_id * 10 + 9, "name": f"Director {movie_id}", "job": "Director"}]
+    return {"id": movie_id, "cast": cast, "crew": crew}
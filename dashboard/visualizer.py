@@ -1,124 +1,237 @@
+import matplotlib
+matplotlib.use("Agg")  # Render straight to files; no display or GUI event loop needed
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+from monitoring.metrics import instrument, metrics
 from storage.db_connector import DatabaseConnector
 
+# Bump when a chart's rendering code changes so existing PNGs are redrawn
+RENDER_VERSION = 1
+
+def _apply_style():
+    """
+    Set the shared plot style (also run in each render worker process)
+    """
+    sns.set_style("darkgrid")
+    plt.rcParams["figure.figsize"] = (12, 8)
+
+def render_movies_by_year(movies_by_year: pd.DataFrame, path: str):
+    """
+    Plot number of movies by release year
+    """
+    plt.figure(figsize=(12, 6))
+    sns.barplot(x="release_year", y="movie_count", data=movies_by_year)
+    plt.title("Number of Movies by Release Year")
+    plt.xlabel("Release Year")
+    plt.ylabel("Number of Movies")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    
+    plt.savefig(path)
+    plt.close()
+
+def render_top_rated_movies(top_movies: pd.DataFrame, path: str):
+    """
+    Plot top rated movies
+    """
+    plt.figure(figsize=(12, 6))
+    sns.barplot(x="weighted_rating", y="title", data=top_movies)
+    plt.title("Top 10 Movies by Weighted Rating")
+    plt.xlabel("Weighted Rating")
+    plt.ylabel("Movie Title")
+    plt.tight_layout()
+    
+    plt.savefig(path)
+    plt.close()
+
+def render_language_distribution(language_counts: pd.DataFrame, path: str):
+    """
+    Plot distribution of original languages
+    """
+    main_languages = language_counts.set_index("original_language")["movie_count"]
+    
+    plt.figure(figsize=(10, 10))
+    plt.pie(main_languages, labels=main_languages.index, autopct="%1.1f%%",
+            shadow=True, startangle=90)
+    plt.axis("equal")
+    plt.title("Distribution of Original Languages")
+    
+    plt.savefig(path)
+    plt.close()
+
+def render_vote_vs_popularity(movies: pd.DataFrame, path: str):
+    """
+    Plot vote average vs popularity
+    """
+    plt.figure(figsize=(10, 8))
+    sns.scatterplot(x="popularity", y="vote_average",
+                    size="vote_count", sizes=(20, 500),
+                    alpha=0.7, data=movies)
+    plt.title("Vote Average vs Popularity")
+    plt.xlabel("Popularity")
+    plt.ylabel("Vote Average")
+    
+    plt.savefig(path)
+    plt.close()
+
+def _render(renderer: Callable[[pd.DataFrame, str], None], data: pd.DataFrame, path: str) -> float:
+    """
+    Render one chart and return the seconds it took (measured in the worker process)
+    """
+    start = time.perf_counter()
+    _apply_style()
+    renderer(data, path)
+    return time.perf_counter() - start
+
+def fingerprint(name: str, data: pd.DataFrame) -> str:
+    """
+    Hash a chart's input data (values, index and column names)
+    
+    Args:
+        name: Chart name
+        data: Query result the chart is drawn from
+    
+    Returns:
+        Hex digest that changes whenever the chart would change
+    """
+    digest = hashlib.sha256(f"{name}:{RENDER_VERSION}:{list(data.columns)}".encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
 class MovieDashboard:
     """
     Creates visualizations for movie data
+    
+    Chart data is queried in this process; charts whose data changed since
+    the last run are rendered in parallel worker processes, the rest are
+    left as they are.
     """
     
-    def __init__(self, db_connector: DatabaseConnector):
+    CHARTS = {
+        "movies_by_year": render_movies_by_year,
+        "top_rated_movies": render_top_rated_movies,
+        "language_distribution": render_language_distribution,
+        "vote_vs_popularity": render_vote_vs_popularity,
+    }
+    
+    def __init__(self, db_connector: DatabaseConnector, max_scatter_points: int = 5000,
+                 output_dir: str = "visualizations", workers: Optional[int] = None):
         """
         Initialize the dashboard
         
         Args:
             db_connector: Database connector
+            max_scatter_points: Approximate number of movies sampled for scatter plots
+            output_dir: Directory the PNGs (and their fingerprint files) are written to
+            workers: Render processes (defaults to one per changed chart, up to the CPU count)
         """
         self.db = db_connector
+        self.max_scatter_points = max_scatter_points
+        self.output_dir = output_dir
+        self.workers = workers
         
         # Create output directory if it doesn't exist
-        os.makedirs("visualizations", exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+    
+    @instrument("dashboard.query")
+    def chart_data(self) -> Dict[str, pd.DataFrame]:
+        """
+        Query the (already aggregated) data behind every chart
         
-        # Set style
-        sns.set_style("darkgrid")
-        plt.rcParams["figure.figsize"] = (12, 8)
+        Returns:
+            Dictionary of chart name to DataFrame
+        """
+        return {
+            "movies_by_year": self.db.get_movies_by_year(),
+            "top_rated_movies": self.db.get_top_rated_movies(10),
+            # Languages with fewer than 3 movies are grouped as "Other" in SQL
+            "language_distribution": self.db.get_language_counts(min_count=3),
+            # Only the plotted columns, sampled down for large catalogs
+            "vote_vs_popularity": self.db.get_scatter_data(["popularity", "vote_average", "vote_count"],
+                                                           max_points=self.max_scatter_points),
+        }
+    
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{name}.png")
+    
+    def _is_current(self, name: str, digest: str) -> bool:
+        """
+        Check whether the chart's PNG was rendered from data with this fingerprint
+        """
+        if not os.path.exists(self._path(name)):
+            return False
+        try:
+            with open(self._path(name) + ".json") as sidecar:
+                return json.load(sidecar).get("fingerprint") == digest
+        except (OSError, ValueError):
+            return False
+    
+    def _save_fingerprint(self, name: str, digest: str):
+        with open(self._path(name) + ".json", "w") as sidecar:
+            json.dump({"fingerprint": digest}, sidecar)
     
-    def generate_visualizations(self):
+    @instrument("dashboard.generate")
+    def generate_visualizations(self, force: bool = False):
         """
-        Generate all visualizations
+        Generate all visualizations, re-rendering only charts whose data changed
+        
+        Args:
+            force: Render every chart even if its fingerprint matches
         """
-        self.plot_movies_by_year()
-        self.plot_top_rated_movies()
-        self.plot_language_distribution()
-        self.plot_vote_vs_popularity()
+        stale = {}
+        for name, data in self.chart_data().items():
+            digest = fingerprint(name, data)
+            if force or not self._is_current(name, digest):
+                stale[name] = (data, digest)
         
-        print("Visualizations saved to 'visualizations' directory")
+        workers = min(len(stale), self.workers or os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {name: executor.submit(_render, self.CHARTS[name], data, self._path(name))
+                           for name, (data, _) in stale.items()}
+                for name, future in futures.items():
+                    metrics.record(f"dashboard.render.{name}", future.result(), len(stale[name][0]))
+                    self._save_fingerprint(name, stale[name][1])
+        else:
+            for name, (data, digest) in stale.items():
+                metrics.record(f"dashboard.render.{name}", _render(self.CHARTS[name], data, self._path(name)),
+                               len(data))
+                self._save_fingerprint(name, digest)
+        
+        print(f"Visualizations saved to '{self.output_dir}' directory "
+              f"({len(stale)} rendered, {len(self.CHARTS) - len(stale)} unchanged)")
     
     def plot_movies_by_year(self):
         """
         Plot number of movies by release year
         """
-        # Get data
-        movies_by_year = self.db.get_movies_by_year()
-        
-        # Create plot
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x="release_year", y="movie_count", data=movies_by_year)
-        plt.title("Number of Movies by Release Year")
-        plt.xlabel("Release Year")
-        plt.ylabel("Number of Movies")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        
-        # Save plot
-        plt.savefig("visualizations/movies_by_year.png")
-        plt.close()
+        _render(render_movies_by_year, self.db.get_movies_by_year(), self._path("movies_by_year"))
     
     def plot_top_rated_movies(self):
         """
         Plot top rated movies
         """
-        # Get data
-        top_movies = self.db.get_top_rated_movies(10)
-        
-        # Create plot
-        plt.figure(figsize=(12, 6))
-        sns.barplot(x="weighted_rating", y="title", data=top_movies)
-        plt.title("Top 10 Movies by Weighted Rating")
-        plt.xlabel("Weighted Rating")
-        plt.ylabel("Movie Title")
-        plt.tight_layout()
-        
-        # Save plot
-        plt.savefig("visualizations/top_rated_movies.png")
-        plt.close()
+        _render(render_top_rated_movies, self.db.get_top_rated_movies(10), self._path("top_rated_movies"))
     
     def plot_language_distribution(self):
         """
         Plot distribution of original languages
         """
-        # Get data
-        movies = self.db.get_movies()
-        language_counts = movies["original_language"].value_counts()
-        
-        # Group languages with few occurrences
-        threshold = 3
-        other_languages = language_counts[language_counts < threshold].sum()
-        main_languages = language_counts[language_counts >= threshold]
-        
-        # Add "Other" category
-        if other_languages > 0:
-            main_languages["Other"] = other_languages
-        
-        # Create plot
-        plt.figure(figsize=(10, 10))
-        plt.pie(main_languages, labels=main_languages.index, autopct="%1.1f%%", 
-                shadow=True, startangle=90)
-        plt.axis("equal")
-        plt.title("Distribution of Original Languages")
-        
-        # Save plot
-        plt.savefig("visualizations/language_distribution.png")
-        plt.close()
+        _render(render_language_distribution, self.db.get_language_counts(min_count=3),
+                self._path("language_distribution"))
     
     def plot_vote_vs_popularity(self):
         """
         Plot vote average vs popularity
         """
-        # Get data
-        movies = self.db.get_movies()
-        
-        # Create plot
-        plt.figure(figsize=(10, 8))
-        sns.scatterplot(x="popularity", y="vote_average", 
-                        size="vote_count", sizes=(20, 500),
-                        alpha=0.7, data=movies)
-        plt.title("Vote Average vs Popularity")
-        plt.xlabel("Popularity")
-        plt.ylabel("Vote Average")
-        
-        # Save plot
-        plt.savefig("visualizations/vote_vs_popularity.png")
-        plt.close()
+        _render(render_vote_vs_popularity,
+                self.db.get_scatter_data(["popularity", "vote_average", "vote_count"],
+                                         max_points=self.max_scatter_points),
+                self._path("vote_vs_popularity"))
@@ -1,48 +1,631 @@
+import argparse
 import os
+import sys
 import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 from dotenv import load_dotenv
 
-from scraper.data_collector import MovieDataCollector
-from processor.transformer import DataTransformer
+from monitoring.metrics import metrics
 from storage.db_connector import DatabaseConnector
-from dashboard.visualizer import MovieDashboard
+from storage.table_format import print_rows
 
-def main():
+# pandas, matplotlib, requests and pyarrow are imported inside the commands that
+# need them, so quick commands (query, check) start without loading them
+if TYPE_CHECKING:
+    from processor.transformer import DataTransformer
+    from scraper.data_collector import MovieDataCollector
+    from storage.journal import RunJournal
+    from storage.landing import LandingZone
+
+COMMANDS = ("harvest", "transform", "load", "report", "query", "check")
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the DataHarvester pipeline")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    harvest = commands.add_parser("harvest", help="Collect from the TMDB API, transform, store and report "
+                                                  "(the default when no command is given)")
+    add_harvest_options(harvest)
+    add_report_options(harvest)
+    
+    transform = commands.add_parser("transform", help="Transform landed payloads into a processed movies file")
+    add_landing_options(transform)
+    transform.add_argument("--output", required=True, metavar="PATH",
+                           help="Processed movies file: .parquet (needs pyarrow), else a pickle (.pkl, .pkl.gz)")
+    
+    load = commands.add_parser("load", help="Load a processed movies file, or replay the landing zone, "
+                                            "into the database")
+    add_landing_options(load)
+    load.add_argument("--input", metavar="PATH", help="Processed movies file written by 'transform'")
+    
+    report = commands.add_parser("report", help="Regenerate the dashboard from the database")
+    add_report_options(report)
+    
+    query = commands.add_parser("query", help="Print query results from the database")
+    queries = query.add_subparsers(dest="query", metavar="QUERY", required=True)
+    top = queries.add_parser("top", help="Top rated movies")
+    top.add_argument("--limit", type=int, default=10)
+    genre = queries.add_parser("genre", help="Best rated movies of a genre")
+    genre.add_argument("name", help="Genre name (e.g. Action)")
+    genre.add_argument("--limit", type=int, default=10)
+    search = queries.add_parser("search", help="Full-text search over titles and overviews, best match first")
+    search.add_argument("terms", nargs="+", help="Search terms (a trailing * matches a prefix)")
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--raw", action="store_true", help="Treat the terms as FTS5 query syntax")
+    sql = queries.add_parser("sql", help="Run a read-only SQL query")
+    sql.add_argument("statement")
+    
+    check = commands.add_parser("check", help="Check the database is reachable and report table sizes "
+                                              "(exit status 1 if not)")
+    check.add_argument("--summaries", action="store_true",
+                       help="Also compare the summary tables with a full recompute, rebuilding them on drift")
+    
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Bare options (the original CLI) still mean harvest
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["harvest"] + argv
+    return parser.parse_args(argv)
+
+def add_landing_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--landing-dir", default=os.getenv("LANDING_DIR", "landing"),
+                        help="Landing zone every raw API payload is appended to, partitioned by endpoint and run date")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="First run date to replay")
+    parser.add_argument("--until", metavar="YYYY-MM-DD", help="Last run date to replay")
+    parser.add_argument("--transform-workers", type=int, default=1,
+                        help="Processes for the transform stage (partitions are processed in parallel "
+                             "and the mean vote reconciled afterwards)")
+
+def add_report_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--metrics-json", metavar="PATH", help="Write the run's stage timings and metrics as JSON")
+    parser.add_argument("--metrics-prom", metavar="PATH", help="Write the run's metrics in Prometheus text format")
+    parser.add_argument("--profile", metavar="STAGE", nargs="+",
+                        help="Run these stages (names or prefixes, or 'all') under cProfile; "
+                             "profiles are written to profiles/<stage>.prof")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record each stage's peak Python heap with tracemalloc")
+
+def add_harvest_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--pages", type=int, default=5, help="Pages of popular movies to fetch (20 per page)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent API requests")
+    parser.add_argument("--details", action="store_true",
+                        help="Also fetch details and credits for every collected movie")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch and upsert movies that are new or changed since the last run")
+    parser.add_argument("--stream", action="store_true",
+                        help="Collect, transform and store in chunks so memory stays flat for large catalogs")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Movies per chunk in --stream mode")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Like --stream, but fetch, transform, store and details run concurrently as stages "
+                             "connected by bounded queues (transform uses --transform-workers threads)")
+    parser.add_argument("--queue-size", type=int, default=4, help="Items buffered between stages in --pipeline mode")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="Continue the latest unfinished run (or RUN_ID), re-using every page and "
+                             "detail it already fetched")
+    parser.add_argument("--spool-dir", default=os.getenv("SPOOL_DIR", ".spool"),
+                        help="Directory for the run journal and spooled API payloads")
+    add_landing_options(parser)
+    parser.add_argument("--landing-format", metavar="FORMAT",
+                        help="Landing file format: parquet, jsonl.zst or jsonl.gz (default: parquet with pyarrow, "
+                             "else jsonl.zst with zstandard, else jsonl.gz)")
+    parser.add_argument("--no-landing", action="store_true", help="Don't keep raw payloads in the landing zone")
+    parser.add_argument("--replay", action="store_true",
+                        help="Transform and load from the landing zone only, without calling the API")
+    parser.add_argument("--check-summaries", action="store_true",
+                        help="Compare the materialized summary tables with a full recompute and exit "
+                             "(same as 'check --summaries')")
+
+HARVEST_SOURCE = "tmdb_popular"
+
+def collect_incremental(collector: "MovieDataCollector", db: DatabaseConnector, pages: int,
+                        journal: Optional["RunJournal"] = None):
+    """
+    Collect only movies that are new since the last run or that TMDB reports as changed
+    
+    Cached responses are revalidated with the server even while fresh, since a
+    change within their TTL is exactly what an incremental run is looking for.
+    
+    Args:
+        collector: Movie data collector
+        db: Database connector holding the watermark
+        pages: Pages of popular movies to scan for new arrivals
+        journal: Run journal the popular pages are spooled to
+    
+    Returns:
+        List of raw movie dictionaries to upsert
+    """
+    watermark = db.get_watermark(HARVEST_SOURCE)
+    raw_movies = collector.get_popular_movies(pages=pages, journal=journal, revalidate=True)
+    
+    if watermark is None:
+        print("No watermark found, harvesting everything")
+        return raw_movies
+    
+    seen_ids = db.get_seen_ids(HARVEST_SOURCE)
+    new_movies = [movie for movie in raw_movies if movie["id"] not in seen_ids]
+    
+    # Re-fetch only movies we already hold that changed since the last run
+    changed_ids = collector.get_changed_movie_ids(watermark["last_run_at"][:10]) & seen_ids
+    changed_movies = list(collector.iter_movies_with_details(sorted(changed_ids), append_to_response=(),
+                                                             revalidate=True))
+    
+    print(f"Delta since {watermark['last_run_at']}: {len(new_movies)} new, {len(changed_movies)} changed")
+    return new_movies + changed_movies
+
+def check_summaries(db: DatabaseConnector):
+    """
+    Report any drift between the summary tables and the movies table, rebuilding them if needed
+    """
+    db.create_tables()
+    mismatches = db.check_summaries()
+    for table, count in mismatches.items():
+        print(f"{table}: {'OK' if count == 0 else f'{count} rows differ'}")
+    
+    if any(mismatches.values()):
+        print("Rebuilding summary tables from the movies table")
+        db.rebuild_summaries()
+    db.close()
+
+def transform(transformer: "DataTransformer", raw_movies: Union[List[Dict], Dict[str, List]],
+              raw_genres: List[Dict], args, vote_mean: Optional[float] = None):
+    """
+    Run process_movies in this process, or across --transform-workers processes
+    """
+    if args.transform_workers > 1:
+        from processor.parallel import ParallelTransformer
+        return ParallelTransformer(args.transform_workers).process_movies(raw_movies, raw_genres, vote_mean)
+    return transformer.process_movies(raw_movies, raw_genres, vote_mean=vote_mean)
+
+def read_landed(landing: "LandingZone", args):
+    """
+    Read the latest landed version of every movie and genre in the --since/--until run dates
+    
+    Returns:
+        Tuple of (raw movies, raw genres)
+    """
+    with metrics.stage("pipeline.replay.read") as stage:
+        raw_movies = landing.latest_by_id(["popular", "movie"], args.since, args.until)
+        raw_genres = landing.latest_by_id(["genres"], args.since, args.until)
+        stage["rows"] = len(raw_movies)
+    print(f"Replaying {len(raw_movies)} movies and {len(raw_genres)} genres from '{landing.root}'")
+    return raw_movies, raw_genres
+
+def replay(db: DatabaseConnector, landing: "LandingZone", args) -> int:
+    """
+    Rebuild the movie tables from payloads in the landing zone, without calling the API
+    
+    The latest landed version of every movie, genre and details record in
+    the --since/--until run dates is transformed and loaded like a full run.
+    
+    Returns:
+        Number of movies stored
+    """
+    from processor.transformer import DataTransformer
+    
+    raw_movies, raw_genres = read_landed(landing, args)
+    if not raw_movies:
+        return 0
+    
+    transformer = DataTransformer()
+    with metrics.stage("pipeline.transform", rows=len(raw_movies)):
+        movies_df = transform(transformer, raw_movies, raw_genres, args)
+    with metrics.stage("pipeline.store", rows=len(movies_df)):
+        db.store_genres(raw_genres)
+        db.store_movies(movies_df)
+    
+    stored_ids = set(movies_df["id"].tolist())
+    details = [movie for movie in landing.latest_by_id(["details"], args.since, args.until)
+               if movie["id"] in stored_ids]
+    if details:
+        with metrics.stage("pipeline.details", rows=len(details)):
+            db.store_movie_details(transformer.process_movie_details(details))
+    return len(movies_df)
+
+def run_streaming(collector: "MovieDataCollector", transformer: "DataTransformer", db: DatabaseConnector,
+                  raw_genres: List[Dict], journal: "RunJournal", args) -> int:
+    """
+    Stream pages through transform and load, committing one chunk at a time
+    
+    Existing rows are upserted rather than replaced, so a run that stops
+    part-way keeps every chunk committed so far. Weighted ratings are
+    recomputed against the exact catalog mean once all chunks are stored.
+    
+    Args:
+        collector: Movie data collector
+        transformer: Data transformer
+        db: Database connector
+        raw_genres: TMDB genre list
+        journal: Run journal fetched pages and details are spooled to
+        args: Parsed command-line arguments
+    
+    Returns:
+        Number of movies stored
+    """
+    db.store_genres(raw_genres)
+    stored = 0
+    
+    chunks = transformer.iter_process_movies(collector.iter_popular_pages(args.pages, journal), raw_genres,
+                                             chunk_size=args.chunk_size)
+    for movies_df in chunks:
+        db.upsert_movies(movies_df)
+        db.add_seen_ids(HARVEST_SOURCE, movies_df["id"].tolist())
+        stored += len(movies_df)
+        
+        if args.details:
+            details = collector.iter_movies_with_details(movies_df["id"].tolist(), journal=journal)
+            db.store_movie_details(transformer.process_movie_details(details))
+    
+    # Second pass: apply the catalog-wide mean vote in SQL
+    vote_mean = db.refresh_weighted_ratings(transformer.MIN_VOTES)
+    print(f"Streamed {stored} movies in chunks of {args.chunk_size} (mean vote {vote_mean or 0:.2f})")
+    return stored
+
+def run_pipelined(collector: "MovieDataCollector", transformer: "DataTransformer", db: DatabaseConnector,
+                  raw_genres: List[Dict], journal: "RunJournal", args) -> int:
+    """
+    Run the streaming harvest as concurrent stages: fetch -> transform -> store (-> details -> store details)
+    
+    Pages are fetched while earlier chunks are transformed and stored, so
+    the run takes about as long as its slowest stage. Stores stay on one
+    worker each since SQLite has a single writer. Weighted ratings are
+    recomputed against the exact catalog mean once all chunks are stored.
+    
+    Args:
+        collector: Movie data collector (the source stage, fetching with --workers requests in flight)
+        transformer: Data transformer
+        db: Database connector
+        raw_genres: TMDB genre list
+        journal: Run journal fetched pages and details are spooled to
+        args: Parsed command-line arguments
+    
+    Returns:
+        Number of movies stored
+    """
+    from pipeline.scheduler import Stage, StagePipeline
+    
+    db.store_genres(raw_genres)
+    stored = 0
+    
+    def transform_chunk(pages: List[List[Dict]]):
+        return transformer.process_movies([movie for page in pages for movie in page], raw_genres)
+    
+    def store_chunk(movies_df):
+        nonlocal stored
+        db.upsert_movies(movies_df)
+        db.add_seen_ids(HARVEST_SOURCE, movies_df["id"].tolist())
+        stored += len(movies_df)
+        return movies_df["id"].tolist() if args.details else None
+    
+    def fetch_details(movie_ids: List[int]):
+        details = collector.iter_movies_with_details(movie_ids, journal=journal)
+        return transformer.process_movie_details(details)
+    
+    stages = [
+        Stage("transform", transform_chunk, workers=args.transform_workers, batch_size=max(1, args.chunk_size // 20)),
+        Stage("store", store_chunk),
+    ]
+    if args.details:
+        stages += [Stage("details", fetch_details), Stage("store_details", db.store_movie_details)]
+    
+    stats = StagePipeline(collector.iter_popular_pages(args.pages, journal), stages, args.queue_size).run()
+    for name, stage_stats in stats.items():
+        print(f"Stage {name}: {stage_stats['items']} items in {stage_stats['calls']} calls, "
+              f"busy {stage_stats['busy_seconds']:.2f}s")
+    
+    # Second pass: apply the catalog-wide mean vote in SQL
+    vote_mean = db.refresh_weighted_ratings(transformer.MIN_VOTES)
+    print(f"Pipelined {stored} movies in chunks of {args.chunk_size} (mean vote {vote_mean or 0:.2f})")
+    return stored
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    
     # Load environment variables
     load_dotenv()
+    
+    commands = {
+        "harvest": run_harvest,
+        "transform": run_transform,
+        "load": run_load,
+        "report": run_report,
+        "query": run_query,
+        "check": run_check,
+    }
+    return commands[args.command](args) or 0
+
+def database_url() -> str:
+    return os.getenv("DATABASE_URL", "movie_data.db")
+
+def open_database() -> DatabaseConnector:
+    """
+    Open the configured database; QUERY_CACHE_PATH, if set, persists cached query results between runs
+    """
+    return DatabaseConnector(database_url(), cache_path=os.getenv("QUERY_CACHE_PATH"))
+
+def database_exists(db: DatabaseConnector) -> bool:
+    """
+    Report an error when the configured SQLite file is missing (reading it would otherwise create it empty)
+    """
+    sqlite_path = db.connections.sqlite_path
+    if sqlite_path not in (None, ":memory:") and not os.path.exists(sqlite_path):
+        print(f"Error: database {os.path.abspath(sqlite_path)} not found")
+        return False
+    return True
+
+def run_harvest(args) -> Optional[int]:
+    """
+    Collect from the TMDB API (or replay the landing zone), transform, store and report
+    """
+    from scraper.cache import SQLiteResponseCache
+    from scraper.data_collector import MovieDataCollector
+    from storage.journal import RunJournal
+    from storage.landing import LandingZone
+    
+    if args.check_summaries:
+        check_summaries(open_database())
+        return
+    
+    if args.replay:
+        print("Replaying DataHarvester pipeline from the landing zone...")
+        start_time = time.time()
+        metrics.configure(profile=args.profile, trace_memory=args.trace_memory)
+        db = open_database()
+        db.create_tables()
+        replay(db, LandingZone(args.landing_dir), args)
+        finish(db, start_time, args)
+        return
+    
     api_key = os.getenv("TMDB_API_KEY")
     
     if not api_key:
         print("Error: No API key found. Please create a .env file with your TMDB_API_KEY.")
-        return
+        return 1
     
     print("Starting DataHarvester pipeline...")
     start_time = time.time()
+    metrics.configure(profile=args.profile, trace_memory=args.trace_memory)
     
     # Step 1: Collect data
     print("\n--- Step 1: Collecting movie data from TMDB API ---")
-    collector = MovieDataCollector(api_key)
-    raw_movies = collector.get_popular_movies(pages=5)  # Get 100 movies (20 per page)
-    raw_genres = collector.get_genres()
+    db = open_database()
+    db.create_tables()
+    
+    journal = RunJournal(args.spool_dir)
+    try:
+        journal.start(HARVEST_SOURCE, {"pages": args.pages, "incremental": args.incremental,
+                                       "stream": args.stream, "pipeline": args.pipeline, "details": args.details},
+                      resume=args.resume is not None, run_id=None if args.resume in (None, "latest") else args.resume)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    print(f"{'Resuming' if journal.resumed else 'Started'} run {journal.run_id}")
+    # A resumed run's watermark is its original start, so changes made since then are fetched next time
+    run_started_at = datetime.fromisoformat(journal.started_at)
+    
+    landing = None if args.no_landing else LandingZone(args.landing_dir, run_id=journal.run_id,
+                                                        file_format=args.landing_format)
+    cache = SQLiteResponseCache(os.getenv("TMDB_CACHE_PATH", ".cache/tmdb_responses.db"))
+    collector = MovieDataCollector(api_key, workers=args.workers, landing=landing, cache=cache,
+                                   base_url=os.getenv("TMDB_BASE_URL"))
+    
+    try:
+        harvest(collector, db, journal, run_started_at, args)
+    except BaseException:
+        journal.finish("failed")
+        print(f"\nRun {journal.run_id} failed; fetched data is kept in {args.spool_dir}, "
+              f"continue with --resume {journal.run_id}")
+        raise
+    finally:
+        if landing is not None:
+            landing.close()
+    print(f"Response cache: {cache.stats}")
+    journal.finish()
+    journal.close()
+    
+    finish(db, start_time, args)
+
+def run_transform(args) -> Optional[int]:
+    """
+    Transform landed payloads into a processed movies file, without touching the database
+    """
+    from processor.transformer import DataTransformer
+    from storage.landing import LandingZone
+    from storage.processed import write_processed_movies
+    
+    raw_movies, raw_genres = read_landed(LandingZone(args.landing_dir), args)
+    if not raw_movies:
+        print("Nothing to transform")
+        return 1
+    
+    with metrics.stage("pipeline.transform", rows=len(raw_movies)):
+        movies_df = transform(DataTransformer(), raw_movies, raw_genres, args)
+    # The genre list travels in the file so 'load' can store the TMDB genre IDs
+    try:
+        write_processed_movies(movies_df, raw_genres, args.output)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    print(f"Wrote {len(movies_df)} processed movies to {args.output}")
+
+def run_load(args) -> Optional[int]:
+    """
+    Load a processed movies file into the database, or replay the landing zone when none is given
+    """
+    if args.input is None:
+        from storage.landing import LandingZone
+        db = open_database()
+        db.create_tables()
+        stored = replay(db, LandingZone(args.landing_dir), args)
+    else:
+        from storage.processed import read_processed_movies
+        
+        try:
+            movies_df, raw_genres = read_processed_movies(args.input)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return 1
+        db = open_database()
+        db.create_tables()
+        with metrics.stage("pipeline.store", rows=len(movies_df)):
+            db.store_genres(raw_genres)
+            db.store_movies(movies_df)
+        stored = len(movies_df)
+    
+    db.close()
+    print(f"Loaded {stored} movies")
+
+def run_report(args) -> Optional[int]:
+    """
+    Regenerate the dashboard from the database
+    """
+    metrics.configure(profile=args.profile, trace_memory=args.trace_memory)
+    db = open_database()
+    db.create_tables()
+    finish(db, time.time(), args)
+
+def run_query(args) -> Optional[int]:
+    """
+    Print a query's results straight from the database cursor (no pandas)
+    """
+    db = open_database()
+    if not database_exists(db):
+        db.close()
+        return 1
+    
+    try:
+        if args.query == "top":
+            columns, rows = db.get_top_rated_rows(args.limit)
+        elif args.query == "genre":
+            columns, rows = db.get_movies_by_genre_rows(args.name, args.limit)
+        elif args.query == "search":
+            columns, rows = db.search_rows(" ".join(args.terms), args.limit, raw=args.raw)
+        else:
+            columns, rows = db.query_rows(args.statement, cache=False)
+    except db.connections.errors as error:
+        # Bad SQL, FTS5 query syntax or a missing table
+        print(f"Error: {error}")
+        return 1
+    finally:
+        db.close()
+    print_rows(columns, rows)
+
+def run_check(args) -> Optional[int]:
+    """
+    Health check: the database is reachable and holds the movie tables
+    """
+    db = open_database()
+    if not database_exists(db):
+        db.close()
+        return 1
+    
+    try:
+        for table in ("movies", "genres", "movie_genres"):
+            _, rows = db.query_rows(f"SELECT COUNT(*) FROM {table}", cache=False)
+            print(f"{table}: {rows[0][0]} rows")
+    except Exception as error:
+        print(f"Error: {error}")
+        db.close()
+        return 1
+    
+    if args.summaries:
+        check_summaries(db)
+    else:
+        db.close()
+    print("Database OK")
+
+def harvest(collector: "MovieDataCollector", db: DatabaseConnector, journal: "RunJournal",
+            run_started_at: datetime, args):
+    """
+    Collect, transform and store movies, spooling every fetched payload to the run journal
+    
+    Stages already completed by a resumed run are skipped; the rest re-use
+    the journal's spooled pages and details instead of fetching them again.
+    """
+    from processor.transformer import DataTransformer
+    
+    if args.pipeline and not args.incremental:
+        print("Pipelined: collect, transform and store run concurrently, chunk by chunk")
+        with metrics.stage("pipeline.run"):
+            run_pipelined(collector, DataTransformer(), db, collector.get_genres(), journal, args)
+            db.save_watermark(HARVEST_SOURCE, run_started_at, args.pages)
+        return
+    
+    if args.stream and not args.incremental:
+        print("Streaming: collect, transform and store run chunk by chunk")
+        with metrics.stage("pipeline.stream"):
+            run_streaming(collector, DataTransformer(), db, collector.get_genres(), journal, args)
+            db.save_watermark(HARVEST_SOURCE, run_started_at, args.pages)
+        return
+    
+    with metrics.stage("pipeline.collect") as stage:
+        if args.incremental:
+            raw_movies = collect_incremental(collector, db, args.pages, journal)
+            movie_count = len(raw_movies)
+        else:
+            # Gathered as columns page by page, the input process_movies unpacks fastest
+            raw_movies = collector.get_popular_movie_columns(DataTransformer.RAW_FIELDS, pages=args.pages,
+                                                             journal=journal)
+            movie_count = len(raw_movies["id"])
+        raw_genres = collector.get_genres()
+        stage["rows"] = movie_count
     
     # Step 2: Transform data
     print("\n--- Step 2: Transforming and cleaning data ---")
     transformer = DataTransformer()
-    movies_df = transformer.process_movies(raw_movies, raw_genres)
+    with metrics.stage("pipeline.transform", rows=movie_count):
+        vote_mean = db.get_vote_mean() if args.incremental else None
+        movies_df = transform(transformer, raw_movies, raw_genres, args, vote_mean)
     
     # Step 3: Store in database
     print("\n--- Step 3: Storing data in SQLite database ---")
-    db = DatabaseConnector("movie_data.db")
-    db.create_tables()
-    db.store_movies(movies_df)
+    if journal.stage_done("store"):
+        print(f"Already stored by run {journal.run_id}, skipping")
+    else:
+        with metrics.stage("pipeline.store", rows=len(movies_df)):
+            db.store_genres(raw_genres)
+            if args.incremental:
+                if len(movies_df):
+                    db.upsert_movies(movies_df)
+            else:
+                db.store_movies(movies_df)
+            db.save_watermark(HARVEST_SOURCE, run_started_at, args.pages, movies_df["id"].tolist())
+        journal.mark_stage("store")
+    
+    # Optional: details + credits, one request per movie
+    if args.details and not journal.stage_done("details"):
+        print("\n--- Collecting movie details and credits ---")
+        with metrics.stage("pipeline.details", rows=len(movies_df)):
+            details = collector.iter_movies_with_details(movies_df["id"].tolist(), journal=journal)
+            db.store_movie_details(transformer.process_movie_details(details))
+        journal.mark_stage("details")
+
+def finish(db: DatabaseConnector, start_time: float, args):
+    """
+    Generate the dashboard from the stored data, close the database and report the run's metrics
+    """
+    from dashboard.visualizer import MovieDashboard
     
     # Step 4: Visualize data
     print("\n--- Step 4: Generating visualizations ---")
-    dashboard = MovieDashboard(db)
-    dashboard.generate_visualizations()
+    with metrics.stage("pipeline.dashboard"):
+        dashboard = MovieDashboard(db)
+        dashboard.generate_visualizations()
+    
+    db.close()
+    
+    print("\n--- Run metrics ---")
+    print(metrics.summary())
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+        print(f"Run report written to {args.metrics_json}")
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+        print(f"Prometheus metrics written to {args.metrics_prom}")
+    for path in metrics.write_profiles():
+        print(f"Profile written to {path}")
     
     elapsed_time = time.time() - start_time
     print(f"\nDataHarvester pipeline completed in {elapsed_time:.2f} seconds!")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
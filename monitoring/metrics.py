@@ -0,0 +1,379 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Prometheus-style latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process so far, or None if the platform can't tell
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports kilobytes
+
+def _labels(labels: Optional[Dict[str, Any]]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+class _StageStats:
+    __slots__ = ("calls", "seconds", "rows", "peak_rss_bytes", "memory_peak_bytes")
+    
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.peak_rss_bytes = None
+        self.memory_peak_bytes = None
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "count", "total")
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+                break
+
+class MetricsRegistry:
+    """
+    Collects per-stage timings, counters and histograms for one pipeline run
+    
+    Stages are timed with the stage() context manager or the instrument()
+    decorator; HTTP latencies go into histograms and retries, cache outcomes
+    and the like into counters. Everything is thread-safe. cProfile and
+    tracemalloc are opt-in per stage because both slow the stage down, and
+    only cover stages run on the main thread: tracemalloc's peak is
+    process-wide and one profiler can't follow several threads, so stages
+    running concurrently on other threads (e.g. with --pipeline) would
+    corrupt each other's figures. Their work still counts towards the
+    enclosing main-thread stage's memory peak.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self):
+        """
+        Drop everything recorded so far and turn profiling off
+        """
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self.stages: Dict[str, _StageStats] = {}
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            self.histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+            self.profiles: Dict[str, cProfile.Profile] = {}
+            self.profile_stages: Optional[Iterable[str]] = None
+            self.profile_dir = "profiles"
+            self.trace_memory = False
+    
+    def configure(self, profile: Optional[Iterable[str]] = None, profile_dir: str = "profiles",
+                  trace_memory: bool = False):
+        """
+        Turn on the opt-in profilers
+        
+        Args:
+            profile: Stage names (or prefixes such as "db.") to run under cProfile; "all" profiles every stage
+            profile_dir: Directory the .prof files are written to by write_profiles()
+            trace_memory: Record each stage's peak Python heap with tracemalloc
+        """
+        self.profile_stages = [profile] if isinstance(profile, str) else profile
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+    
+    def _should_profile(self, name: str) -> bool:
+        if not self.profile_stages:
+            return False
+        return any(prefix == "all" or name.startswith(prefix) for prefix in self.profile_stages)
+    
+    def _stack(self) -> List[Dict]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+    
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Time a block as one call of a stage
+        
+        Args:
+            name: Stage name (dotted, e.g. "db.store_movies")
+            rows: Rows processed, if known up front
+        
+        Yields:
+            Dictionary whose "rows" entry can be set inside the block
+        """
+        frame = {"rows": rows, "memory_peak": 0}
+        stack = self._stack()
+        main_thread = threading.current_thread() is threading.main_thread()
+        trace_memory = self.trace_memory and main_thread
+        
+        profiler = None
+        if main_thread and self._should_profile(name) and not any(entry.get("profiling") for entry in stack):
+            # Only one profiler can be active per thread, so nested stages share the outer one
+            profiler = self.profiles.setdefault(name, cProfile.Profile())
+            frame["profiling"] = True
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+            frame["memory_start"] = tracemalloc.get_traced_memory()[0]
+        
+        stack.append(frame)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield frame
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            
+            memory_peak = None
+            if trace_memory:
+                memory_peak = max(frame["memory_peak"], tracemalloc.get_traced_memory()[1] - frame["memory_start"])
+                if stack:
+                    # An inner stage resets the peak, so hand its peak to the enclosing stage
+                    stack[-1]["memory_peak"] = max(stack[-1]["memory_peak"],
+                                                   memory_peak + frame["memory_start"] - stack[-1]["memory_start"])
+            self.record(name, elapsed, frame["rows"], memory_peak)
+    
+    def record(self, name: str, seconds: float, rows: Optional[int] = None,
+               memory_peak_bytes: Optional[int] = None):
+        """
+        Add one call of a stage timed elsewhere (e.g. in a worker process)
+        """
+        rss = peak_rss_bytes()
+        with self._lock:
+            stats = self.stages.setdefault(name, _StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += rows or 0
+            stats.peak_rss_bytes = rss
+            if memory_peak_bytes is not None:
+                stats.memory_peak_bytes = max(stats.memory_peak_bytes or 0, memory_peak_bytes)
+    
+    def increment(self, name: str, amount: float = 1, labels: Optional[Dict[str, Any]] = None):
+        """
+        Add to a counter (e.g. "http_retries")
+        """
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None,
+                buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Add a sample (e.g. a request latency in seconds) to a histogram
+        """
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+    
+    def report(self) -> Dict:
+        """
+        Build the run report
+        
+        Returns:
+            JSON-serializable dictionary of stages, counters, histograms and peak RSS
+        """
+        with self._lock:
+            stages = {}
+            for name, stats in sorted(self.stages.items()):
+                stages[name] = {
+                    "calls": stats.calls,
+                    "seconds": round(stats.seconds, 6),
+                    "rows": stats.rows,
+                    "rows_per_sec": round(stats.rows / stats.seconds, 1) if stats.rows and stats.seconds else None,
+                    "peak_rss_bytes": stats.peak_rss_bytes,
+                }
+                if stats.memory_peak_bytes is not None:
+                    stages[name]["memory_peak_bytes"] = stats.memory_peak_bytes
+            
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{
+                "name": name,
+                "labels": dict(labels),
+                "count": histogram.count,
+                "sum": round(histogram.total, 6),
+                "buckets": dict(zip(map(str, histogram.buckets), histogram.counts)),
+            } for (name, labels), histogram in sorted(self.histograms.items())]
+        
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": round((datetime.now(timezone.utc) - self.started_at).total_seconds(), 3),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": stages,
+            "counters": counters,
+            "histograms": histograms,
+        }
+    
+    def to_prometheus(self, prefix: str = "dataharvester") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+        
+        Args:
+            prefix: Metric name prefix
+        
+        Returns:
+            Metrics text (e.g. for the node_exporter textfile collector)
+        """
+        def labels_text(labels: Dict[str, Any]) -> str:
+            if not labels:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+        
+        report = self.report()
+        lines = []
+        
+        for metric, field in (("stage_seconds_total", "seconds"), ("stage_calls_total", "calls"),
+                              ("stage_rows_total", "rows")):
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            lines.extend(f"{prefix}_{metric}{labels_text({'stage': name})} {stats[field]}"
+                         for name, stats in report["stages"].items())
+        
+        for name in sorted({counter["name"] for counter in report["counters"]}):
+            metric = re.sub(r"[^a-zA-Z0-9_]", "_", name)
+            lines.append(f"# TYPE {prefix}_{metric}_total counter")
+            lines.extend(f"{prefix}_{metric}_total{labels_text(counter['labels'])} {counter['value']}"
+                         for counter in report["counters"] if counter["name"] == name)
+        
+        for name in sorted({histogram["name"] for histogram in report["histograms"]}):
+            metric = re.sub(r"[^a-zA-Z0-9_]", "_", name)
+            lines.append(f"# TYPE {prefix}_{metric} histogram")
+            for histogram in (item for item in report["histograms"] if item["name"] == name):
+                cumulative = 0
+                for bound, count in histogram["buckets"].items():
+                    cumulative += count
+                    lines.append(f"{prefix}_{metric}_bucket{labels_text({**histogram['labels'], 'le': bound})} {cumulative}")
+                lines.append(f"{prefix}_{metric}_bucket{labels_text({**histogram['labels'], 'le': '+Inf'})} {histogram['count']}")
+                lines.append(f"{prefix}_{metric}_sum{labels_text(histogram['labels'])} {histogram['sum']}")
+                lines.append(f"{prefix}_{metric}_count{labels_text(histogram['labels'])} {histogram['count']}")
+        
+        if report["peak_rss_bytes"] is not None:
+            lines.append(f"# TYPE {prefix}_peak_rss_bytes gauge")
+            lines.append(f"{prefix}_peak_rss_bytes {report['peak_rss_bytes']}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def write_json(self, path: str):
+        """
+        Write the run report as JSON
+        """
+        with open(path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+    
+    def write_prometheus(self, path: str):
+        """
+        Write the metrics in Prometheus text format
+        """
+        with open(path, "w") as metrics_file:
+            metrics_file.write(self.to_prometheus())
+    
+    def write_profiles(self) -> List[str]:
+        """
+        Dump each profiled stage to <profile_dir>/<stage>.prof (open with pstats or snakeviz)
+        
+        Returns:
+            Paths written
+        """
+        if not self.profiles:
+            return []
+        os.makedirs(self.profile_dir, exist_ok=True)
+        
+        paths = []
+        for name, profiler in self.profiles.items():
+            path = os.path.join(self.profile_dir, f"{name}.prof")
+            profiler.dump_stats(path)
+            paths.append(path)
+        return paths
+    
+    def summary(self) -> str:
+        """
+        Format the stage timings as a small table for the console
+        """
+        report = self.report()
+        lines = [f"{'stage':<40} {'calls':>6} {'seconds':>9} {'rows':>9} {'rows/s':>10}"]
+        for name, stats in report["stages"].items():
+            rate = f"{stats['rows_per_sec']:,.0f}" if stats["rows_per_sec"] else "-"
+            lines.append(f"{name:<40} {stats['calls']:>6} {stats['seconds']:>9.3f} {stats['rows']:>9} {rate:>10}")
+        if report["peak_rss_bytes"] is not None:
+            lines.append(f"Peak RSS: {report['peak_rss_bytes'] / 2**20:.1f} MiB")
+        return "\n".join(lines)
+
+# Registry shared by the instrumented modules for the current run
+metrics = MetricsRegistry()
+
+def instrument(stage: str, rows: Optional[str] = None) -> Callable:
+    """
+    Decorator that times every call of a function as a stage in the shared registry
+    
+    Args:
+        stage: Stage name
+        rows: Where to count processed rows: "result" for len() of the return
+            value, or the name of an argument whose len() is taken (a dictionary
+            of columns counts the values of its first column)
+    
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.stage(stage) as frame:
+                if rows is not None and rows != "result":
+                    frame["rows"] = _length(signature.bind(*args, **kwargs).arguments.get(rows))
+                result = func(*args, **kwargs)
+                if rows == "result":
+                    frame["rows"] = _length(result)
+                return result
+        
+        return wrapper
+    
+    return decorator
+
+def _length(value: Any) -> Optional[int]:
+    if isinstance(value, dict) and value and all(isinstance(column, list) for column in value.values()):
+        value = next(iter(value.values()))  # Columns, e.g. from get_popular_movie_columns
+    try:
+        return len(value)
+    except TypeError:
+        return None  # Generators and other lazy iterables have no length
@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from monitoring.metrics import metrics
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+class Stage:
+    """
+    One step of a StagePipeline: a function applied to every item by a pool of worker threads
+    """
+    
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, batch_size: int = 1,
+                 queue_size: Optional[int] = None):
+        """
+        Initialize the stage
+        
+        Args:
+            name: Stage name, recorded in the run metrics as pipeline.<name>
+            func: Called with each input item (or a list of up to batch_size items);
+                its result is passed to the next stage unless it is None
+            workers: Threads running func concurrently; results may leave out of order when > 1
+            batch_size: Input items handed to func per call
+            queue_size: Bound of the stage's input queue (defaults to the pipeline's)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = queue_size
+    
+    def __repr__(self):
+        return f"<Stage {self.name} x{self.workers}>"
+
+
+class StagePipeline:
+    """
+    Runs a source iterable through a chain of stages connected by bounded queues
+    
+    Every stage runs in its own threads, so fetching, transforming and
+    loading overlap and the run takes about as long as its slowest stage
+    rather than the sum of all of them. A full queue blocks the stage
+    feeding it (backpressure), so at most queue_size items wait between
+    two stages. The first exception raised anywhere stops every stage and
+    is re-raised by run().
+    """
+    
+    # How often blocked threads check whether the pipeline has been stopped
+    POLL_SECONDS = 0.1
+    
+    def __init__(self, source: Iterable, stages: Sequence[Stage], queue_size: int = 4):
+        """
+        Initialize the pipeline
+        
+        Args:
+            source: Iterable of input items, consumed in a thread of its own
+            stages: Stages in order; the last one's results are discarded
+            queue_size: Default bound of each stage's input queue
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.source = source
+        self.stages = list(stages)
+        self.queues = [queue.Queue(maxsize=stage.queue_size or queue_size) for stage in self.stages]
+        self.stats = {stage.name: {"items": 0, "calls": 0, "busy_seconds": 0.0} for stage in self.stages}
+        
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self._lock = threading.Lock()
+        self._running = [stage.workers for stage in self.stages]
+    
+    def _fail(self, error: BaseException):
+        with self._lock:
+            self._errors.append(error)
+        self._stop.set()
+    
+    def _put(self, index: int, item: Any) -> bool:
+        """
+        Put an item on a stage's input queue, waiting while it is full; False once the pipeline is stopped
+        """
+        if index == len(self.queues):
+            return True  # Results of the last stage go nowhere
+        while not self._stop.is_set():
+            try:
+                self.queues[index].put(item, timeout=self.POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get(self, index: int) -> Any:
+        """
+        Take an item from a stage's input queue, or _DONE once the pipeline is stopped
+        """
+        while not self._stop.is_set():
+            try:
+                return self.queues[index].get(timeout=self.POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+    
+    def _feed(self):
+        try:
+            for item in self.source:
+                if not self._put(0, item):
+                    break
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            close = getattr(self.source, "close", None)
+            if close is not None:
+                close()  # Shut down a generator's own workers if it was abandoned part-way
+            self._put(0, _DONE)
+    
+    def _work(self, index: int):
+        stage = self.stages[index]
+        finished = False
+        try:
+            while not finished:
+                batch = []
+                while len(batch) < stage.batch_size:
+                    item = self._get(index)
+                    if item is _DONE:
+                        finished = True
+                        break
+                    batch.append(item)
+                if not batch or self._stop.is_set():
+                    continue
+                
+                start = time.perf_counter()
+                with metrics.stage(f"pipeline.{stage.name}") as frame:
+                    result = stage.func(batch if stage.batch_size > 1 else batch[0])
+                    if hasattr(result, "__len__"):
+                        frame["rows"] = len(result)
+                with self._lock:
+                    stats = self.stats[stage.name]
+                    stats["items"] += len(batch)
+                    stats["calls"] += 1
+                    stats["busy_seconds"] += time.perf_counter() - start
+                
+                if result is not None and not self._put(index + 1, result):
+                    break
+        except BaseException as error:
+            self._fail(error)
+        finally:
+            if finished:
+                self._put(index, _DONE)  # Let this stage's other workers see the end of the stream
+            with self._lock:
+                self._running[index] -= 1
+                last = self._running[index] == 0
+            if last:
+                self._put(index + 1, _DONE)
+    
+    def run(self) -> Dict[str, Dict]:
+        """
+        Run the pipeline until the source is exhausted and every stage has drained
+        
+        Returns:
+            Per-stage dictionary of items processed, calls and busy seconds
+        
+        Raises:
+            The first exception raised by the source or any stage
+        """
+        threads = [threading.Thread(target=self._feed, name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            threads += [threading.Thread(target=self._work, args=(index,), name=f"pipeline-{stage.name}-{worker}",
+                                         daemon=True)
+                        for worker in range(stage.workers)]
+        
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(self.POLL_SECONDS)
+        except BaseException as error:
+            # Ctrl-C in the main thread: stop the stages and wait for them to let go
+            self._fail(error)
+            for thread in threads:
+                thread.join()
+        
+        if self._errors:
+            raise self._errors[0]
+        return self.stats
@@ -1,40 +1,154 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import re
+from monitoring.metrics import instrument
+
+# A feature step maps the movie frame (plus enrich options) to new columns
+FeatureStep = Callable[..., Dict[str, Any]]
 
 class DataEnricher:
     """
     Adds additional features and data to the movie dataset
+    
+    Features come from registered steps that each return new columns; enrich()
+    runs any number of steps in one pass and appends all their columns to
+    the frame at once, instead of copying the frame once per step.
     """
+    COMMON_LANGUAGES = ["en", "es", "fr", "de", "it", "ja", "ko", "zh"]
+    
+    # All three title flags from one anchored match per title: lookaheads for
+    # the first colon and the first digit, then a jump to the end of the title
+    # where fixed-width lookbehinds test the sequel suffixes
+    TITLE_PATTERN = re.compile(
+        r"(?:(?=[^:]*(:)))?"
+        r"(?:(?=\D*(\d)))?"
+        r"(?:(?=.*\Z(?:(?<=part)|(?<=vol)|(?<=volume)|(?<=episode)|(?<=\bii)|(?<=\biii)|(?<=\biv)|(?<=[234])))())?",
+        re.IGNORECASE | re.DOTALL
+    )
     
-    def add_genre_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    DEFAULT_STEPS = ("genre", "language", "title")
+    
+    def __init__(self):
+        self.steps: Dict[str, FeatureStep] = {}
+        self.register_step("genre", self._genre_columns)
+        self.register_step("language", self._language_columns)
+        self.register_step("title", self._title_columns)
+    
+    def register_step(self, name: str, step: FeatureStep):
         """
-        Add one-hot encoded genre features
+        Register a feature step
+        
+        Args:
+            name: Step name used in enrich(steps=...)
+            step: Callable taking (df, **options) and returning a dictionary of
+                column name to values (arrays or Series aligned with df)
+        """
+        self.steps[name] = step
+    
+    @instrument("enrich.pipeline", rows="df")
+    def enrich(self, df: pd.DataFrame, steps: Optional[Sequence[str]] = None, inplace: bool = False,
+               **options) -> pd.DataFrame:
+        """
+        Run feature steps in one pass and append their columns
         
         Args:
             df: Movie DataFrame
-            
+            steps: Registered step names, in column order (defaults to DEFAULT_STEPS)
+            inplace: Add the columns to df itself rather than to a new frame
+                sharing df's data
+            **options: Options passed to every step (e.g. genres, sparse)
+        
         Returns:
-            DataFrame with added genre features
+            DataFrame with every step's columns appended
+        """
+        columns = {}
+        for name in steps or self.DEFAULT_STEPS:
+            columns.update(self.steps[name](df, **options))
+        
+        features = pd.DataFrame(columns, index=df.index, copy=False)
+        if inplace:
+            df[features.columns] = features
+            return df
+        return pd.concat([df, features], axis=1, copy=False)
+    
+    @staticmethod
+    def _genre_columns(df: pd.DataFrame, genres: Optional[List[Dict]] = None, sparse: bool = False,
+                       **_) -> Dict[str, Any]:
         """
-        # Create a copy to avoid SettingWithCopyWarning
-        enriched_df = df.copy()
+        One-hot genre flags (uint8) from the genre_list column
+        """
+        # One row per (movie position, genre name); non-list values explode to NaN
+        exploded = df["genre_list"].reset_index(drop=True).explode()
+        
+        if genres:
+            names = [genre["name"] for genre in genres]
+        else:
+            names = sorted(exploded.dropna().unique())
         
-        # Get all unique genres
-        all_genres = set()
-        for genres in enriched_df["genre_list"]:
-            if isinstance(genres, list):
-                all_genres.update(genres)
+        codes = pd.Categorical(exploded.to_numpy(), categories=names).codes
+        known = codes >= 0
         
-        # Create one-hot encoded columns for genres
-        for genre in all_genres:
-            col_name = f"genre_{genre.lower().replace(' ', '_')}"
-            enriched_df[col_name] = enriched_df["genre_list"].apply(
-                lambda x: 1 if isinstance(x, list) and genre in x else 0
-            )
+        matrix = np.zeros((len(df), len(names)), dtype=np.uint8)
+        matrix[exploded.index.to_numpy()[known], codes[known]] = 1
         
-        return enriched_df
+        columns = {}
+        for position, name in enumerate(names):
+            values = matrix[:, position]
+            if sparse:
+                values = pd.arrays.SparseArray(values, fill_value=0)
+            columns[f"genre_{name.lower().replace(' ', '_')}"] = values
+        return columns
     
+    @classmethod
+    def _language_columns(cls, df: pd.DataFrame, **_) -> Dict[str, Any]:
+        """
+        is_<lang> flags for the common languages plus is_other_language, from categorical codes
+        """
+        codes = pd.Categorical(df["original_language"].to_numpy(), categories=cls.COMMON_LANGUAGES).codes
+        # Code -1 (any other language, or missing) lands in the last column
+        matrix = np.zeros((len(df), len(cls.COMMON_LANGUAGES) + 1), dtype=np.uint8)
+        matrix[np.arange(len(df)), np.where(codes >= 0, codes, len(cls.COMMON_LANGUAGES))] = 1
+        
+        columns = {f"is_{lang}": matrix[:, position] for position, lang in enumerate(cls.COMMON_LANGUAGES)}
+        columns["is_other_language"] = matrix[:, -1]
+        return columns
+    
+    @classmethod
+    def _title_columns(cls, df: pd.DataFrame, **_) -> Dict[str, Any]:
+        """
+        has_colon_in_title, has_number_in_title and is_likely_sequel flags from one regex scan per title
+        """
+        match = cls.TITLE_PATTERN.match
+        groups = [match(title).groups() if isinstance(title, str) else (None, None, None)
+                  for title in df["title"].to_numpy(dtype=object)]
+        flags = pd.DataFrame(groups, columns=range(3)).notna().to_numpy(np.uint8)
+        
+        return {"has_colon_in_title": flags[:, 0], "has_number_in_title": flags[:, 1], "is_likely_sequel": flags[:, 2]}
+    
+    @instrument("enrich.genre_features", rows="df")
+    def add_genre_features(self, df: pd.DataFrame, genres: Optional[List[Dict]] = None,
+                           sparse: bool = False, as_matrix: bool = False) -> pd.DataFrame:
+        """
+        Add one-hot encoded genre features
+        
+        Args:
+            df: Movie DataFrame
+            genres: Full genre list (from MovieDataCollector.get_genres), which fixes
+                the feature columns and their order across runs; defaults to the
+                genres present in df, sorted by name
+            sparse: Return pandas sparse uint8 columns instead of dense uint8
+            as_matrix: Return only the genre feature matrix (indexed like df)
+                instead of the widened movie frame
+            
+        Returns:
+            DataFrame with added genre features, or the feature matrix
+        """
+        if as_matrix:
+            return pd.DataFrame(self._genre_columns(df, genres=genres, sparse=sparse), index=df.index, copy=False)
+        return self.enrich(df, ["genre"], genres=genres, sparse=sparse)
+    
+    @instrument("enrich.language_features", rows="df")
     def add_language_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Add features related to language
@@ -45,19 +159,9 @@ class DataEnricher:
         Returns:
             DataFrame with added language features
         """
-        # Create a copy to avoid SettingWithCopyWarning
-        enriched_df = df.copy()
-        
-        # Add common language indicators
-        common_languages = ["en", "es", "fr", "de", "it", "ja", "ko", "zh"]
-        for lang in common_languages:
-            enriched_df[f"is_{lang}"] = (enriched_df["original_language"] == lang).astype(int)
-        
-        # Group other languages
-        enriched_df["is_other_language"] = (~enriched_df["original_language"].isin(common_languages)).astype(int)
-        
-        return enriched_df
+        return self.enrich(df, ["language"])
     
+    @instrument("enrich.title_features", rows="df")
     def extract_title_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Extract features from movie titles
@@ -68,15 +172,5 @@ class DataEnricher:
         Returns:
             DataFrame with title features
         """
-        # Create a copy to avoid SettingWithCopyWarning
-        enriched_df = df.copy()
-        
-        # Check for patterns in titles
-        enriched_df["has_colon_in_title"] = enriched_df["title"].str.contains(":").astype(int)
-        enriched_df["has_number_in_title"] = enriched_df["title"].str.contains(r'\d').astype(int)
-        
-        # Check for sequel indicators
-        sequel_patterns = r'(?i)(part|vol|volume|episode|\bii\b|\biii\b|\biv\b|2|3|4)$'
-        enriched_df["is_likely_sequel"] = enriched_df["title"].str.contains(sequel_patterns).astype(int)
-        
-        return enriched_df
+        return self.enrich(df, ["title"])
+        
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import pandas as pd
+from monitoring.metrics import instrument
+from processor.enricher import DataEnricher
+from processor.transformer import DataTransformer
+from storage.dtypes import apply_dtypes
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional: partitions travel pickled (lists of dicts, DataFrames) without it
+    pa = None
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on Windows or macOS
+        return os.cpu_count() or 1
+
+def _to_ipc(table: "pa.Table"):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def _pack(df: pd.DataFrame):
+    """
+    Serialize a processed partition for the trip back to the parent process
+    
+    With pyarrow the frame goes as one Arrow IPC buffer, which crosses the
+    process boundary as a single bytes copy instead of pickling every
+    object in the string and list columns.
+    """
+    if pa is None:
+        return df
+    return _to_ipc(pa.Table.from_pandas(df, preserve_index=False))
+
+def _row_count(movies: Union[List[Dict], Dict[str, List]]) -> int:
+    return len(next(iter(movies.values()), ())) if isinstance(movies, dict) else len(movies)
+
+def _pack_inputs(movies: Union[List[Dict], Dict[str, List]], size: int) -> List[object]:
+    """
+    Split raw movies (records or columns) into partitions of size for the trip to the workers
+    
+    With pyarrow the raw fields are converted to Arrow columns once and each
+    partition goes as an IPC buffer; the workers then build their frame with
+    to_pandas instead of unpickling a dictionary per movie. Input Arrow
+    can't type (mixed values in a field) goes pickled instead.
+    """
+    columnar = isinstance(movies, dict)
+    starts = range(0, _row_count(movies), size)
+    if pa is not None:
+        try:
+            table = pa.table(movies if columnar else
+                             {name: [movie.get(name) for movie in movies] for name in DataTransformer.RAW_FIELDS})
+            return [_to_ipc(table.slice(start, size)) for start in starts]
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    if columnar:
+        return [{name: values[start:start + size] for name, values in movies.items()} for start in starts]
+    return [movies[start:start + size] for start in starts]
+
+def _unpack(packed) -> pd.DataFrame:
+    if isinstance(packed, pd.DataFrame):
+        return packed
+    df = pa.ipc.open_stream(packed).read_all().to_pandas()
+    # Arrow hands list columns back as arrays; the rest of the pipeline expects lists
+    if "genre_list" in df:
+        df["genre_list"] = df["genre_list"].map(list)
+    return df
+
+def _process_partition(movies: Union[List[Dict], Dict[str, List], "pa.Buffer"], genres: List[Dict], enrich: bool,
+                       pack: bool = True) -> Tuple[object, float, int]:
+    """
+    Transform (and optionally enrich) one partition, packed for the parent process unless pack is False
+    
+    Args:
+        movies: Raw movies (records or columns), or an Arrow IPC buffer of their columns from _pack_inputs
+    
+    Returns:
+        Tuple of (packed frame, sum of vote_average, row count) for reconciling the mean vote
+    """
+    if pa is not None and isinstance(movies, pa.Buffer):
+        movies = pa.ipc.open_stream(movies).read_all().to_pandas()
+    df = DataTransformer().process_movies(movies, genres)
+    if enrich:
+        df = DataEnricher().enrich(df, genres=genres, inplace=True)
+    return _pack(df) if pack else df, float(df["vote_average"].astype("float64").sum()), len(df)
+
+class ParallelTransformer:
+    """
+    Runs the transform (and enrich) chain over partitions of the input in a process pool
+    
+    Rows are independent except for the mean vote C in the weighted rating,
+    so each partition is processed on its own and C is reconciled from the
+    partitions' vote sums once they have all finished.
+    
+    Shipping partitions to and from the workers costs about as much as
+    transforming them, so the pool never gets more workers than there are
+    CPUs to run them, and with a single CPU the chain runs in this process.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, partitions_per_worker: int = 2, enrich: bool = False):
+        """
+        Initialize the parallel transformer
+        
+        Args:
+            workers: Worker processes (defaults to, and is capped at, the available CPUs)
+            partitions_per_worker: Partitions per worker, so a slow partition doesn't idle the others
+            enrich: Also add genre, language and title features
+        """
+        cpus = _available_cpus()
+        self.workers = max(1, min(workers or cpus, cpus))
+        if workers and workers > self.workers:
+            print(f"Transforming with {self.workers} worker(s): {workers} requested, but only {cpus} CPU(s) available"
+                  + (", so the transform runs in this process" if self.workers == 1 else ""))
+        self.partitions_per_worker = max(1, partitions_per_worker)
+        self.enrich = enrich
+    
+    @instrument("transform.parallel", rows="result")
+    def process_movies(self, movies: Union[List[Dict], Dict[str, List]], genres: List[Dict],
+                       vote_mean: Optional[float] = None) -> pd.DataFrame:
+        """
+        Process raw movies like DataTransformer.process_movies, across worker processes
+        
+        Args:
+            movies: Raw movie dictionaries, or a dict of column lists
+            genres: List of genre dictionaries
+            vote_mean: Mean vote across the whole catalog; defaults to the mean of this batch
+        
+        Returns:
+            Processed DataFrame, rows in input order
+        """
+        rows = _row_count(movies)
+        partitions = min(rows, self.workers * self.partitions_per_worker)
+        if self.workers == 1 or partitions <= 1:
+            results = [_process_partition(movies, genres, self.enrich, pack=False)]
+        else:
+            size = -(-rows // partitions)
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_process_partition, partition, genres, self.enrich)
+                           for partition in _pack_inputs(movies, size)]
+                results = [future.result() for future in futures]
+        
+        # Partitions have their own category sets, which concat widens to object; restore the schema
+        df = apply_dtypes(pd.concat([_unpack(packed) for packed, _, _ in results], ignore_index=True))
+        
+        # Reconcile C across partitions and re-rate every row against it
+        if vote_mean is None:
+            rows = sum(count for _, _, count in results)
+            vote_mean = sum(total for _, total, _ in results) / rows if rows else 0.0
+        df["weighted_rating"] = DataTransformer.weighted_rating(df["vote_average"], df["vote_count"], vote_mean)
+        return df
@@ -1,81 +1,287 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from monitoring.metrics import instrument
+from storage.dtypes import MOVIE_DTYPES, apply_dtypes
 
 class DataTransformer:
     """
     Transforms raw movie data into clean, structured format
     """
+    COLUMNS = [
+        "id", "title", "original_title", "overview", "popularity", "vote_average",
+        "vote_count", "release_date", "release_year", "genres", "genre_list", "adult",
+        "poster_path", "backdrop_path", "original_language"
+    ]
     
-    def process_movies(self, movies: List[Dict], genres: List[Dict]) -> pd.DataFrame:
+    # Raw TMDB fields read by process_movies
+    RAW_FIELDS = [
+        "id", "title", "original_title", "overview", "popularity", "vote_average",
+        "vote_count", "release_date", "genre_ids", "genres", "adult",
+        "poster_path", "backdrop_path", "original_language"
+    ]
+    
+    # Raw fields parsed straight to float64 arrays from columnar input (None becomes NaN)
+    NUMERIC_FIELDS = {"id", "popularity", "vote_average", "vote_count"}
+    
+    # Minimum votes (m) in the weighted rating
+    MIN_VOTES = 100
+    
+    @instrument("transform.process_movies", rows="result")
+    def process_movies(self, movies: Union[List[Dict], Dict[str, List], pd.DataFrame],
+                       genres: List[Dict], vote_mean: Optional[float] = None) -> pd.DataFrame:
         """
         Process movie data into a clean pandas DataFrame
         
+        The transform is columnar: the raw frame is built from the records in
+        one pass, dates are parsed in one vectorized call and genre IDs are
+        mapped once per distinct genre combination. Unpacking the records is
+        the costliest step, so columnar input, as gathered page by page by
+        MovieDataCollector.get_popular_movie_columns, is faster still.
+        
         Args:
-            movies: List of raw movie data dictionaries
+            movies: Raw movies as a list of dictionaries (list results or movie details),
+                or columnar input (a DataFrame or a dict of column lists)
             genres: List of genre dictionaries
-            
+            vote_mean: Mean vote across the whole catalog (C in the weighted rating);
+                defaults to the mean of this batch
+        
         Returns:
-            Processed DataFrame
+            Processed DataFrame in the compact dtypes of storage.dtypes.MOVIE_DTYPES,
+            without the movies that have no id
         """
         # Create a genre lookup dictionary
         genre_lookup = {genre["id"]: genre["name"] for genre in genres}
         
-        # Extract relevant fields and normalize data
-        processed_data = []
+        # Gather the raw columns; fields missing from the input become NaN columns
+        if isinstance(movies, dict):
+            columns = {name: self._column_array(values, name in self.NUMERIC_FIELDS)
+                       for name, values in movies.items()}
+            index = pd.RangeIndex(len(next(iter(columns.values()), ())))
+        else:
+            # Records are unpacked in one C pass over the dicts, cheaper than one Python pass per field
+            columns = movies if isinstance(movies, pd.DataFrame) else pd.DataFrame.from_records(
+                movies, columns=self.RAW_FIELDS)
+            index = columns.index
         
-        for movie in movies:
-            # Convert genre IDs to names
-            genre_names = [genre_lookup.get(genre_id, "Unknown") 
-                          for genre_id in movie.get("genre_ids", [])]
-            
-            # Parse release date
-            release_date = None
+        def field(name: str) -> pd.Series:
+            if name not in columns:
+                return pd.Series(np.nan, index=index, dtype=object)
+            return pd.Series(columns[name], index=index, copy=False)
+        
+        # Parse each distinct release date once; missing or invalid dates become NaT
+        date_codes, date_values = pd.factorize(field("release_date"))
+        parsed_dates = pd.to_datetime(pd.Series(date_values, dtype=object), format="%Y-%m-%d", errors="coerce")
+        parsed_dates = np.append(parsed_dates.to_numpy(), np.datetime64("NaT"))  # Code -1 (missing) maps to NaT
+        release_date = pd.Series(parsed_dates[date_codes], index=index)
+        
+        genre_list, genre_names = self._map_genres(field("genre_ids"), field("genres"), genre_lookup)
+        
+        df = pd.DataFrame({
+            "id": field("id"),
+            "title": field("title"),
+            "original_title": field("original_title"),
+            "overview": field("overview"),
+            "popularity": field("popularity"),
+            "vote_average": field("vote_average"),
+            "vote_count": field("vote_count"),
+            "release_date": release_date,
+            "release_year": release_date.dt.year,
+            "genres": genre_names,
+            "genre_list": genre_list,
+            "adult": field("adult").fillna(False).astype(bool),
+            "poster_path": field("poster_path"),
+            "backdrop_path": field("backdrop_path"),
+            "original_language": field("original_language")
+        }, index=index, copy=False)
+        
+        # Rows without an id can't be stored, nor cast to the schema's int32 id
+        missing_id = df["id"].isna().to_numpy()
+        if missing_id.any():
+            print(f"Dropped {int(missing_id.sum())} movies without an id")
+            df = df[~missing_id].reset_index(drop=True)
+        
+        # Clean and transform data
+        return self._clean_dataframe(df, vote_mean)
+    
+    def iter_process_movies(self, pages: Iterable[List[Dict]], genres: List[Dict],
+                            chunk_size: int = 10000, vote_mean: Optional[float] = None) -> Iterator[pd.DataFrame]:
+        """
+        Process a stream of raw movie pages in fixed-size chunks
+        
+        Only one chunk of raw records is held at a time. Without a vote_mean,
+        each chunk's weighted rating uses the running mean of every movie seen
+        so far; the exact catalog-wide value is applied afterwards with
+        DatabaseConnector.refresh_weighted_ratings.
+        
+        Args:
+            pages: Iterable of raw movie lists (e.g. MovieDataCollector.iter_popular_pages)
+            genres: List of genre dictionaries
+            chunk_size: Movies per processed chunk
+            vote_mean: Mean vote across the whole catalog, if already known
+        
+        Yields:
+            Processed DataFrames of at most chunk_size movies
+        """
+        buffer = []
+        vote_total, vote_rows = 0.0, 0
+        
+        def process(chunk: List[Dict]) -> pd.DataFrame:
+            nonlocal vote_total, vote_rows
+            df = self.process_movies(chunk, genres, vote_mean=vote_mean)
+            if vote_mean is None and len(df):
+                # Re-rate against the running mean rather than this chunk alone
+                vote_total += df["vote_average"].astype(np.float64).sum()
+                vote_rows += len(df)
+                df["weighted_rating"] = self.weighted_rating(df["vote_average"], df["vote_count"],
+                                                             vote_total / vote_rows)
+            return df
+        
+        for page in pages:
+            buffer.extend(page)
+            while len(buffer) >= chunk_size:
+                chunk, buffer = buffer[:chunk_size], buffer[chunk_size:]
+                yield process(chunk)
+        
+        if buffer:
+            yield process(buffer)
+    
+    @classmethod
+    def weighted_rating(cls, vote_average: pd.Series, vote_count: pd.Series, vote_mean: float) -> pd.Series:
+        """
+        IMDB weighted rating of each movie given the catalog-wide mean vote
+        
+        Computed in float64 and returned in the schema's float32.
+        """
+        m = cls.MIN_VOTES
+        v = vote_count.astype(np.float64)
+        R = vote_average.astype(np.float64)
+        rating = (v / (v + m)) * R + (m / (v + m)) * vote_mean
+        return rating.astype(MOVIE_DTYPES["weighted_rating"])
+    
+    @staticmethod
+    def _column_array(values: Sequence, numeric: bool = False) -> np.ndarray:
+        """
+        One raw field as an array: float64 when numeric and every value converts, else object
+        """
+        if isinstance(values, (np.ndarray, pd.Series)):
+            return values
+        if numeric:
             try:
-                if movie.get("release_date"):
-                    release_date = datetime.strptime(movie["release_date"], "%Y-%m-%d")
-            except ValueError:
-                pass  # Keep as None if date is invalid
-            
-            # Create processed movie record
-            processed_movie = {
-                "id": movie.get("id"),
-                "title": movie.get("title"),
-                "original_title": movie.get("original_title"),
-                "overview": movie.get("overview"),
-                "popularity": movie.get("popularity"),
-                "vote_average": movie.get("vote_average"),
-                "vote_count": movie.get("vote_count"),
-                "release_date": release_date,
-                "release_year": release_date.year if release_date else None,
-                "genres": ", ".join(genre_names),
-                "genre_list": genre_names,
-                "adult": movie.get("adult", False),
-                "poster_path": movie.get("poster_path"),
-                "backdrop_path": movie.get("backdrop_path"),
-                "original_language": movie.get("original_language")
-            }
+                return np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                pass
+        # fromiter keeps list values (genre_ids) as objects instead of a 2-D array, and skips np.array's shape discovery
+        return np.fromiter(values, dtype=object, count=len(values))
+    
+    @staticmethod
+    def _map_genres(genre_ids: pd.Series, genre_objects: pd.Series,
+                    genre_lookup: Dict[int, str]) -> Tuple[np.ndarray, pd.Categorical]:
+        """
+        Map genre IDs to names once per distinct genre combination
+        
+        Rows with the same genres share one genre_list object, so treat the
+        lists as read-only.
+        
+        Returns:
+            Tuple of (genre_list values as an object array, comma-joined genre names as a categorical)
+        """
+        values = genre_ids.to_numpy(dtype=object, copy=True)
+        for position in np.flatnonzero(pd.isna(values)):
+            values[position] = ()  # Some rows have no genre_ids at all
+        keys = list(map(tuple, values))
+        
+        # List results carry genre_ids, movie details carry genre objects instead
+        empty = [position for position, key in enumerate(keys) if not key]
+        if empty:
+            genre_objects = genre_objects.to_numpy(dtype=object)
+            for position in empty:
+                objects = genre_objects[position]
+                if isinstance(objects, (list, tuple, np.ndarray)):  # Arrays when read from Arrow
+                    keys[position] = tuple(genre["id"] for genre in objects)
+        
+        # Number the distinct combinations in a dict; pandas would first copy the tuples into an object array
+        combination_codes: Dict[Tuple, int] = dict.fromkeys(keys)
+        for code, combination in enumerate(combination_codes):
+            combination_codes[combination] = code
+        codes = np.fromiter(map(combination_codes.__getitem__, keys), dtype=np.intp, count=len(keys))
+        
+        names = np.empty(len(combination_codes), dtype=object)
+        joined = np.empty(len(combination_codes), dtype=object)
+        for code, combination in enumerate(combination_codes):
+            names[code] = [genre_lookup.get(genre_id, "Unknown") for genre_id in combination]
+            joined[code] = ", ".join(names[code])
+        
+        # Combinations can join to the same names (unknown IDs); categories are sorted like astype("category")
+        categories, joined_codes = np.unique(joined, return_inverse=True)
+        return names[codes], pd.Categorical.from_codes(joined_codes[codes], categories=categories)
+    
+    @instrument("transform.process_movie_details", rows="result")
+    def process_movie_details(self, details: Iterable[Dict], top_cast: int = 5) -> pd.DataFrame:
+        """
+        Flatten movie details (with appended credits) into one row per movie
+        
+        Args:
+            details: Movie detail dictionaries as returned with append_to_response=credits
+            top_cast: Number of billed cast members to keep
+        
+        Returns:
+            DataFrame with runtime, budget, revenue, director and top cast per movie
+        """
+        processed_data = []
+        
+        for movie in details:
+            credits = movie.get("credits") or {}
+            cast = sorted(credits.get("cast", []), key=lambda member: member.get("order", 0))
+            directors = [member["name"] for member in credits.get("crew", [])
+                         if member.get("job") == "Director"]
             
-            processed_data.append(processed_movie)
+            processed_data.append({
+                "movie_id": movie.get("id"),
+                "runtime": movie.get("runtime"),
+                "budget": movie.get("budget"),
+                "revenue": movie.get("revenue"),
+                "director": ", ".join(directors),
+                "top_cast": ", ".join(member["name"] for member in cast[:top_cast]),
+                "cast_count": len(cast),
+            })
         
-        # Create DataFrame
-        df = pd.DataFrame(processed_data)
+        return pd.DataFrame(processed_data, columns=["movie_id", "runtime", "budget", "revenue",
+                                                     "director", "top_cast", "cast_count"])
+    
+    @staticmethod
+    def _str_lengths(series: pd.Series) -> pd.Series:
+        """
+        Length of each string, NaN where missing (a faster Series.str.len for object columns)
+        """
+        values = series.to_numpy(dtype=object)
+        try:
+            return pd.Series(np.fromiter(map(len, values), dtype=np.int64, count=len(values)), index=series.index)
+        except TypeError:  # Some values are missing
+            pass
         
-        # Clean and transform data
-        return self._clean_dataframe(df)
+        present = ~pd.isna(values)
+        lengths = np.fromiter(map(len, values[present]), dtype=np.int64, count=int(present.sum()))
+        if present.all():
+            return pd.Series(lengths, index=series.index)
+        
+        result = np.full(len(values), np.nan)
+        result[present] = lengths
+        return pd.Series(result, index=series.index)
     
-    def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _clean_dataframe(self, df: pd.DataFrame, vote_mean: Optional[float] = None) -> pd.DataFrame:
         """
         Clean and transform the DataFrame
         
         Args:
             df: Raw DataFrame
-            
+            vote_mean: Catalog-wide mean vote, if known
+        
         Returns:
             Cleaned DataFrame
         """
-        # Make a copy to avoid SettingWithCopyWarning
-        cleaned_df = df.copy()
+        # The frame is built by process_movies, so clean it in place
+        cleaned_df = df
         
         # Fill missing values
         cleaned_df["overview"] = cleaned_df["overview"].fillna("")
@@ -85,22 +291,20 @@ class DataTransformer:
         
         # Create additional features
         cleaned_df["has_english_title"] = cleaned_df["title"] == cleaned_df["original_title"]
-        cleaned_df["title_length"] = cleaned_df["title"].str.len()
-        cleaned_df["overview_length"] = cleaned_df["overview"].str.len()
+        cleaned_df["title_length"] = self._str_lengths(cleaned_df["title"])
+        cleaned_df["overview_length"] = self._str_lengths(cleaned_df["overview"])
         
         # Calculate weighted rating (IMDB formula)
         # Weighted Rating (WR) = (v ÷ (v+m)) × R + (m ÷ (v+m)) × C
         # Where:
         # v = vote count
-        # m = minimum votes required (we'll use 100)
+        # m = minimum votes required (MIN_VOTES)
         # R = average rating for the movie
         # C = mean vote across the whole dataset
-        m = 100  # minimum votes required
-        C = cleaned_df["vote_average"].mean()
+        C = cleaned_df["vote_average"].mean() if vote_mean is None else vote_mean
         
-        cleaned_df["weighted_rating"] = (
-            (cleaned_df["vote_count"] / (cleaned_df["vote_count"] + m)) * cleaned_df["vote_average"] +
-            (m / (cleaned_df["vote_count"] + m)) * C
-        )
+        cleaned_df["weighted_rating"] = self.weighted_rating(cleaned_df["vote_average"],
+                                                             cleaned_df["vote_count"], C)
         
-        return cleaned_df
+        # Compact dtypes: categoricals, float32 ratings, nullable small ints (see storage.dtypes)
+        return apply_dtypes(cleaned_df)
@@ -0,0 +1,235 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, NamedTuple, Optional
+
+class CacheEntry(NamedTuple):
+    """
+    A cached API response
+    """
+    payload: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+    
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache(ABC):
+    """
+    Abstract base class for TMDB response caches
+    
+    Subclasses implement the storage methods (get, set, refresh, clear); the
+    base class provides key building, per-endpoint TTLs and hit/miss counters.
+    """
+    # Longest matching endpoint prefix wins
+    DEFAULT_TTLS = {
+        "/genre/": 7 * 24 * 3600,
+        "/movie/popular": 6 * 3600,
+        "/movie/changes": 15 * 60,
+        "/movie/": 24 * 3600,
+    }
+    IGNORED_PARAMS = ("api_key",)
+    
+    def __init__(self, default_ttl: float = 24 * 3600, ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            default_ttl: TTL in seconds for endpoints without a specific entry
+            ttls: Mapping of endpoint prefix to TTL in seconds, merged over DEFAULT_TTLS
+        """
+        self.default_ttl = default_ttl
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+    
+    def make_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
+        """
+        Build a cache key from the endpoint and params, leaving out credentials
+        """
+        params = {k: v for k, v in (params or {}).items() if k not in self.IGNORED_PARAMS}
+        return endpoint + "?" + json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+    
+    def ttl_for(self, endpoint: str) -> float:
+        """
+        Get the TTL for an endpoint from the longest matching prefix
+        """
+        matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+    
+    def record(self, outcome: str):
+        """
+        Count a lookup outcome ("hits", "misses" or "revalidated")
+        """
+        with self._stats_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters, used to size the cache
+        """
+        lookups = self.hits + self.misses + self.revalidated
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+        }
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry, fresh or stale (None if missing)
+        """
+    
+    @abstractmethod
+    def set(self, key: str, endpoint: str, payload: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a response with the TTL of its endpoint
+        """
+    
+    @abstractmethod
+    def refresh(self, key: str, endpoint: str):
+        """
+        Extend an entry's expiry after the server confirmed it is unchanged
+        """
+    
+    @abstractmethod
+    def clear(self):
+        """
+        Drop every entry
+        """
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache persisted in a SQLite file with size-based LRU eviction
+    """
+    
+    def __init__(self, path: str = ".cache/tmdb_responses.db",
+                 max_bytes: int = 256 * 1024 * 1024, **kwargs):
+        """
+        Args:
+            path: Path to the SQLite cache file
+            max_bytes: Maximum total size of stored (compressed) payloads
+            **kwargs: Passed to ResponseCache (default_ttl, ttls)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_bytes = max_bytes
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT,
+            body BLOB,
+            etag TEXT,
+            last_modified TEXT,
+            expires_at REAL,
+            last_access REAL,
+            size INTEGER
+        )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        
+        body, etag, last_modified, expires_at = row
+        return CacheEntry(json.loads(zlib.decompress(body)), etag, last_modified, expires_at)
+    
+    def set(self, key: str, endpoint: str, payload: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, etag, last_modified, now + self.ttl_for(endpoint), now, len(body))
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+    
+    def refresh(self, key: str, endpoint: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                               (now + self.ttl_for(endpoint), now, key))
+            self._conn.commit()
+    
+    def expire(self, endpoint_prefix: str = ""):
+        """
+        Mark entries as stale so the next lookup revalidates them with the server
+        
+        Args:
+            endpoint_prefix: Only expire entries for endpoints starting with this prefix
+        """
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = 0 WHERE endpoint LIKE ? || '%'",
+                               (endpoint_prefix,))
+            self._conn.commit()
+    
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._size = 0
+    
+    def _evict(self):
+        """
+        Drop least recently used entries until the cache fits in max_bytes
+        """
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self.evictions += 1
+                if self._size <= self.max_bytes:
+                    break
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats
+        with self._lock:
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        stats["size_bytes"] = self._size
+        return stats
+    
+    def close(self):
+        self._conn.close()
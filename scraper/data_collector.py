@@ -1,54 +1,283 @@
-from typing import List, Dict, Any
-import time
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Set
+from datetime import date, datetime, timedelta, timezone
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import requests
 from tqdm import tqdm
+from monitoring.metrics import instrument
 from scraper.tmdb_api import TMDBApi
+from storage.journal import RunJournal
+from storage.landing import LandingZone
 
 class MovieDataCollector:
     """
     Collects movie data from TMDB API
     """
     
-    def __init__(self, api_key: str):
-        self.api = TMDBApi(api_key)
+    def __init__(self, api_key: str, workers: int = 1, landing: Optional[LandingZone] = None, **api_options):
+        """
+        Initialize the collector
+        
+        Args:
+            api_key: TMDB API key
+            workers: Number of concurrent requests (1 fetches sequentially)
+            landing: Landing zone every fetched payload is appended to
+            **api_options: Extra options passed to TMDBApi (requests_per_second, base_url, ...)
+        """
+        self.workers = max(1, workers)
+        self.landing = landing
+        # One pooled connection (and concurrency slot) per worker
+        api_options.setdefault("pool_size", self.workers)
+        self.api = TMDBApi(api_key, **api_options)
     
-    def get_popular_movies(self, pages: int = 5) -> List[Dict]:
+    def _map_ordered(self, func: Callable, items: Sequence[Any], desc: str) -> Iterator[Any]:
         """
-        Get multiple pages of popular movies
+        Apply func to every item, concurrently if workers > 1, yielding results in input order
+        
+        Pacing is handled by the API's shared rate limiter, so workers only
+        control how many requests are in flight at once. At most 2 x workers
+        results are held ahead of the consumer, so a slow consumer keeps
+        memory bounded instead of buffering every result.
+        """
+        if self.workers == 1:
+            yield from tqdm(map(func, items), total=len(items), desc=desc)
+            return
+        
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            with tqdm(total=len(items), desc=desc) as progress:
+                for item in items:
+                    pending.append(executor.submit(func, item))
+                    if len(pending) >= max_pending:
+                        yield pending.popleft().result()
+                        progress.update(1)
+                while pending:
+                    yield pending.popleft().result()
+                    progress.update(1)
+    
+    def _land(self, endpoint: str, records: List[Dict]):
+        if self.landing is not None:
+            self.landing.append(endpoint, records)
+    
+    def _fetch_popular_page(self, page: int, revalidate: bool = False) -> List[Dict]:
+        results = self.api.get_popular_movies(page, revalidate).get("results", [])
+        self._land("popular", results)
+        return results
+    
+    def iter_popular_pages(self, pages: int = 5, journal: Optional[RunJournal] = None,
+                           revalidate: bool = False) -> Iterator[List[Dict]]:
+        """
+        Fetch pages of popular movies lazily, yielding one page of results at a time
         
         Args:
             pages: Number of pages to fetch (20 movies per page)
+            journal: Run journal; every fetched page is spooled to it, and pages
+                it already holds are read back from disk instead of fetched
+            revalidate: Check cached pages with the server even if they are fresh
+        
+        Yields:
+            Lists of movie data dictionaries, in page order
+        """
+        def fetch_page(page: int) -> List[Dict]:
+            return self._fetch_popular_page(page, revalidate)
+        
+        fetch = fetch_page
+        if journal is not None:
+            spooled = journal.completed_items("page")
+            if spooled:
+                print(f"Resuming run {journal.run_id}: {len(spooled & set(range(1, pages + 1)))} "
+                      f"of {pages} pages already fetched")
             
+            def fetch(page: int) -> List[Dict]:
+                if page in spooled:
+                    return journal.load("page", page)
+                return journal.spool("page", page, fetch_page(page))
+        
+        yield from self._map_ordered(fetch, range(1, pages + 1), desc="Fetching movies")
+    
+    @instrument("collect.popular_movies", rows="result")
+    def get_popular_movies(self, pages: int = 5, journal: Optional[RunJournal] = None,
+                           revalidate: bool = False) -> List[Dict]:
+        """
+        Get multiple pages of popular movies
+        
+        Args:
+            pages: Number of pages to fetch (20 movies per page)
+            journal: Run journal to spool pages to and resume from
+            revalidate: Check cached pages with the server even if they are fresh
+        
         Returns:
-            List of movie data dictionaries
+            List of movie data dictionaries, in page order
         """
         movies = []
         
-        for page in tqdm(range(1, pages + 1), desc="Fetching movies"):
-            response = self.api.get_popular_movies(page)
-            movies.extend(response.get("results", []))
-            time.sleep(0.25)  # Respect rate limits
+        for results in self.iter_popular_pages(pages, journal, revalidate):
+            movies.extend(results)
         
         print(f"Collected data for {len(movies)} movies")
         return movies
     
+    @instrument("collect.popular_movies", rows="result")
+    def get_popular_movie_columns(self, fields: Sequence[str], pages: int = 5, journal: Optional[RunJournal] = None,
+                                  revalidate: bool = False) -> Dict[str, List]:
+        """
+        Get multiple pages of popular movies as one list per field
+        
+        Each page is split into the columns as it arrives, while the next
+        pages are still being fetched, so DataTransformer.process_movies
+        doesn't have to unpack every movie dictionary at once.
+        
+        Args:
+            fields: Fields to keep (e.g. DataTransformer.RAW_FIELDS); movies without one get None
+            pages: Number of pages to fetch (20 movies per page)
+            journal: Run journal to spool pages to and resume from
+            revalidate: Check cached pages with the server even if they are fresh
+        
+        Returns:
+            Dictionary of field name to the values of every movie, in page order
+        """
+        columns: Dict[str, List] = {field: [] for field in fields}
+        count = 0
+        
+        for results in self.iter_popular_pages(pages, journal, revalidate):
+            for field, values in columns.items():
+                values.extend([movie.get(field) for movie in results])
+            count += len(results)
+        
+        print(f"Collected data for {count} movies")
+        return columns
+    
     def get_movie_with_details(self, movie_id: int) -> Dict:
         """
-        Get detailed movie information including credits
+        Get detailed movie information including credits in a single request
         
         Args:
             movie_id: TMDB movie ID
+        
+        Returns:
+            Movie details with a "credits" key
+        """
+        return self.api.get_movie_details(movie_id, append_to_response=["credits"])
+    
+    def iter_movies_with_details(self, movie_ids: Iterable[int],
+                                 append_to_response: Sequence[str] = ("credits",),
+                                 journal: Optional[RunJournal] = None,
+                                 spool_batch_size: int = 100, revalidate: bool = False) -> Iterator[Dict]:
+        """
+        Fetch details (plus credits by default) for many movies, yielding each as soon as it completes
+        
+        At most 2 x workers requests are queued at a time, so movie_ids can be
+        a lazy iterable of any length. Movies the API no longer knows (404) are
+        skipped.
+        
+        Args:
+            movie_ids: TMDB movie IDs
+            append_to_response: Sub-requests embedded in each details response
+            journal: Run journal; details are spooled to it in batches, and
+                movies it already holds are read back from disk first (movie_ids
+                is then read up front)
+            spool_batch_size: Movies per spooled batch
+            revalidate: Check cached details with the server even if they are fresh
+        
+        Yields:
+            Movie details, in completion order
+        """
+        if journal is None:
+            yield from self._fetch_movie_details(movie_ids, append_to_response, revalidate)
+            return
+        
+        movie_ids = list(movie_ids)
+        spooled = journal.completed_items("details").intersection(movie_ids)
+        for batch in journal.iter_spooled("details", spooled):
+            yield from (movie for movie in batch if movie["id"] in spooled)
+        
+        key, batch = journal.next_spool_key("details"), []
+        remaining = [movie_id for movie_id in movie_ids if movie_id not in spooled]
+        for movie in self._fetch_movie_details(remaining, append_to_response, revalidate):
+            batch.append(movie)
+            if len(batch) >= spool_batch_size:
+                journal.spool("details", key, batch, [item["id"] for item in batch])
+                key, batch = key + 1, []
+            yield movie
+        if batch:
+            journal.spool("details", key, batch, [item["id"] for item in batch])
+    
+    def _fetch_movie_details(self, movie_ids: Iterable[int], append_to_response: Sequence[str],
+                             revalidate: bool = False) -> Iterator[Dict]:
+        ids = iter(movie_ids)
+        max_pending = self.workers * 2
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            exhausted = False
             
+            with tqdm(desc="Fetching movie details", unit="movie") as progress:
+                while pending or not exhausted:
+                    # Top up the window of in-flight requests
+                    while not exhausted and len(pending) < max_pending:
+                        movie_id = next(ids, None)
+                        if movie_id is None:
+                            exhausted = True
+                        else:
+                            pending.add(executor.submit(self.api.get_movie_details, movie_id,
+                                                        list(append_to_response), revalidate))
+                    
+                    if not pending:
+                        break
+                    
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        progress.update(1)
+                        try:
+                            movie = future.result()
+                        except requests.HTTPError as error:
+                            if error.response is None or error.response.status_code != 404:
+                                raise
+                            continue
+                        # Full details (with credits) and bare movie records land separately
+                        self._land("details" if append_to_response else "movie", [movie])
+                        yield movie
+    
+    @instrument("collect.changed_movie_ids", rows="result")
+    def get_changed_movie_ids(self, start_date: str, end_date: Optional[str] = None) -> Set[int]:
+        """
+        Get IDs of every movie TMDB reports as changed since start_date
+        
+        TMDB answers at most MAX_CHANGES_DAYS per query, so longer ranges are
+        queried in consecutive windows of that many days, both ends
+        included, and the IDs combined.
+        
+        Args:
+            start_date: First day to include (YYYY-MM-DD)
+            end_date: Last day to include (YYYY-MM-DD), defaults to today (UTC)
+        
         Returns:
-            Enriched movie data
+            Set of changed movie IDs
         """
-        movie = self.api.get_movie_details(movie_id)
-        credits = self.api.get_movie_credits(movie_id)
+        first = date.fromisoformat(start_date)
+        last = date.fromisoformat(end_date) if end_date else datetime.now(timezone.utc).date()
+        # Both ends are included, so a window of MAX_CHANGES_DAYS days ends MAX_CHANGES_DAYS - 1 days after it starts
+        window = timedelta(days=self.api.MAX_CHANGES_DAYS - 1)
+        changed_ids = set()
         
-        # Add credits to movie data
-        movie["credits"] = credits
+        window_start = min(first, last)
+        while True:
+            window_end = min(window_start + window, last)
+            page, total_pages = 1, 1
+            while page <= total_pages:
+                response = self.api.get_movie_changes(window_start.isoformat(), window_end.isoformat(), page)
+                changed_ids.update(item["id"] for item in response.get("results", []))
+                total_pages = response.get("total_pages", 1)
+                page += 1
+            if window_end >= last:
+                break
+            window_start = window_end + timedelta(days=1)
         
-        return movie
+        print(f"TMDB reports {len(changed_ids)} changed movies since {start_date}")
+        return changed_ids
     
+    @instrument("collect.genres", rows="result")
     def get_genres(self) -> List[Dict]:
         """
         Get all movie genres
@@ -56,5 +285,6 @@ class MovieDataCollector:
         Returns:
             List of genre dictionaries
         """
-        response = self.api.get_genres()
-        return response.get("genres", [])
+        genres = self.api.get_genres().get("genres", [])
+        self._land("genres", genres)
+        return genres
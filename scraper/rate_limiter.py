@@ -0,0 +1,49 @@
+import threading
+import time
+from typing import Optional
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces callers to a requests-per-second budget
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket
+        
+        Args:
+            rate: Tokens added per second (the requests-per-second budget)
+            capacity: Maximum burst size (defaults to one second worth of tokens)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, sleeping until they are available
+        
+        Tokens are reserved up front, so concurrent callers queue behind each
+        other instead of racing for the next refill.
+        
+        Args:
+            tokens: Number of tokens to take
+            
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -1,59 +1,138 @@
-import requests
+import re
 from typing import Dict, List, Any, Optional
+from monitoring.metrics import metrics
+from scraper.cache import ResponseCache
+from scraper.rate_limiter import TokenBucket
+from scraper.transport import RetryPolicy, Timeout, Transport
 
 class TMDBApi:
     """
     Wrapper for The Movie Database (TMDB) API
     """
     BASE_URL = "https://api.themoviedb.org/3"
+    DEFAULT_REQUESTS_PER_SECOND = 40
     
-    def __init__(self, api_key: str):
+    # Longest date range /movie/changes accepts in one query
+    MAX_CHANGES_DAYS = 14
+    
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        base_url: Optional[str] = None,
+        pool_size: int = 10,
+        cache: Optional[ResponseCache] = None,
+        timeout: Timeout = (3.05, 30.0),
+        retry: Optional[RetryPolicy] = None,
+        adaptive_concurrency: bool = True
+    ):
+        """
+        Initialize the API wrapper
+        
+        Args:
+            api_key: TMDB API key
+            requests_per_second: Request budget shared by all threads using this
+                instance (None disables pacing)
+            base_url: Override for the API base URL (e.g. a local stub server)
+            pool_size: Maximum concurrent requests, and keep-alive connections kept per host
+            cache: Optional response cache consulted before hitting the network
+            timeout: (connect, read) timeout in seconds for each attempt
+            retry: Retry policy for 429/5xx responses and network errors (defaults to RetryPolicy())
+            adaptive_concurrency: Cut concurrency when TMDB answers 429 and grow it back gradually
+        """
         self.api_key = api_key
-        self.session = requests.Session()
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.cache = cache
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self.transport = Transport(pool_size=pool_size, timeout=timeout, retry=retry,
+                                   adaptive=adaptive_concurrency, rate_limiter=self.rate_limiter)
+        self.session = self.transport.session
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None, revalidate: bool = False) -> Dict:
         """
         Make a request to the TMDB API
         
         Args:
             endpoint: API endpoint (without base URL)
             params: Query parameters
+            revalidate: Check a fresh cache entry with the server too (a conditional
+                request), for callers that must see changes made within its TTL
             
         Returns:
             API response as dictionary
         """
-        url = f"{self.BASE_URL}{endpoint}"
-        params = params or {}
+        url = f"{self.base_url}{endpoint}"
+        params = dict(params or {})
+        endpoint_label = re.sub(r"/\d+", "/{id}", endpoint)  # Keep metric label cardinality low
+        
+        # Serve fresh cache entries without a request; stale ones are revalidated
+        entry = None
+        headers = {}
+        if self.cache is not None:
+            cache_key = self.cache.make_key(endpoint, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None and entry.fresh and not revalidate:
+                self.cache.record("hits")
+                metrics.increment("http_cache_hits", labels={"endpoint": endpoint_label})
+                return entry.payload
+            if entry is not None:
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+        
         params["api_key"] = self.api_key
         
-        response = self.session.get(url, params=params)
+        # Rate limiting, timeouts, retries and backoff happen in the transport
+        response = self.transport.get(url, params=params, headers=headers, label=endpoint_label)
+        
+        if response.status_code == 304:
+            if entry is not None:
+                self.cache.refresh(cache_key, endpoint)
+                self.cache.record("revalidated")
+                return entry.payload
+            # Nothing cached to serve (e.g. the entry was evicted): fetch the full body
+            response = self.transport.get(url, params=params, label=endpoint_label)
+
         response.raise_for_status()  # Raise exception for 4XX/5XX responses
+        payload = response.json()
+        
+        if self.cache is not None:
+            self.cache.record("misses")
+            self.cache.set(cache_key, endpoint, payload,
+                           etag=response.headers.get("ETag"),
+                           last_modified=response.headers.get("Last-Modified"))
         
-        return response.json()
+        return payload
     
-    def get_popular_movies(self, page: int = 1) -> Dict:
+    def get_popular_movies(self, page: int = 1, revalidate: bool = False) -> Dict:
         """
         Get popular movies
         
         Args:
             page: Page number
+            revalidate: Check a cached page with the server even if it is fresh
             
         Returns:
             Page of popular movies
         """
-        return self._make_request("/movie/popular", {"page": page})
+        return self._make_request("/movie/popular", {"page": page}, revalidate)
     
-    def get_movie_details(self, movie_id: int) -> Dict:
+    def get_movie_details(self, movie_id: int, append_to_response: Optional[List[str]] = None,
+                          revalidate: bool = False) -> Dict:
         """
         Get detailed information about a movie
         
         Args:
             movie_id: TMDB movie ID
+            append_to_response: Sub-requests to embed in the same response (e.g. ["credits"])
+            revalidate: Check a cached response with the server even if it is fresh
             
         Returns:
             Movie details
         """
-        return self._make_request(f"/movie/{movie_id}")
+        params = {"append_to_response": ",".join(append_to_response)} if append_to_response else None
+        return self._make_request(f"/movie/{movie_id}", params, revalidate)
     
     def get_movie_credits(self, movie_id: int) -> Dict:
         """
@@ -67,6 +146,28 @@ class TMDBApi:
         """
         return self._make_request(f"/movie/{movie_id}/credits")
     
+    def get_movie_changes(self, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None, page: int = 1) -> Dict:
+        """
+        Get IDs of movies changed in a date range (TMDB allows at most MAX_CHANGES_DAYS)
+        
+        A cached page is always revalidated, since the list grows within its TTL.
+        
+        Args:
+            start_date: First day of the range (YYYY-MM-DD), defaults to 24 hours ago
+            end_date: Last day of the range (YYYY-MM-DD)
+            page: Page number
+            
+        Returns:
+            Page of changed movie IDs
+        """
+        params = {"page": page}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        return self._make_request("/movie/changes", params, revalidate=True)
+    
     def get_genres(self) -> Dict:
         """
         Get the list of official genres
@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from monitoring.metrics import metrics
+from scraper.rate_limiter import TokenBucket
+
+Timeout = Union[float, Tuple[float, float]]
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request
+    
+    Delays use exponential backoff with full jitter, so clients that failed
+    together don't retry together. A Retry-After header from the server
+    takes precedence over the computed backoff.
+    """
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_after_max: float = 120.0, seed: Optional[int] = None):
+        """
+        Initialize the retry policy
+        
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base: Upper bound of the first backoff in seconds, doubled on each retry
+            backoff_max: Cap on the backoff upper bound
+            retry_after_max: Longest Retry-After the client is willing to honor
+            seed: Seed for the jitter (for reproducible runs)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self._random = random.Random(seed)
+    
+    def should_retry(self, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        Check whether a failed attempt (0-based) should be retried
+        
+        Args:
+            attempt: Number of retries already made
+            status: HTTP status of the failed attempt (None for connection errors and timeouts)
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.RETRY_STATUSES
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the next retry
+        
+        Args:
+            attempt: Number of retries already made
+            retry_after: Server-requested delay from a Retry-After header
+        """
+        if retry_after is not None:
+            return min(retry_after, self.retry_after_max)
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header given either as seconds or as an HTTP date
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase/multiplicative-decrease limit on requests in flight
+    
+    Every successful response raises the limit by 1/limit (about one more
+    slot per round of requests); a 429 cuts it by decrease_factor, at most
+    once per cooldown so one burst of throttling counts as one signal.
+    """
+    
+    def __init__(self, maximum: int, minimum: int = 1, initial: Optional[int] = None,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        """
+        Initialize the concurrency limit
+        
+        Args:
+            maximum: Upper bound (the number of workers / pooled connections)
+            minimum: Lower bound
+            initial: Starting limit (defaults to maximum)
+            decrease_factor: Multiplier applied to the limit on throttling
+            cooldown: Minimum seconds between two decreases
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self._limit = float(initial or self.maximum)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+    
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold one in-flight slot for the block, waiting while the limit is reached
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+    
+    def on_success(self):
+        with self._condition:
+            if self._limit < self.maximum:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._condition.notify_all()
+    
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._limit = max(self.minimum, self._limit * self.decrease_factor)
+        metrics.increment("http_concurrency_decreases")
+
+class Transport:
+    """
+    HTTP GET with timeouts, retries, rate limiting and adaptive concurrency
+    
+    One pooled session is shared by all threads; its connection pool is
+    sized to the concurrency limit so no request waits for a connection.
+    """
+    
+    def __init__(self, pool_size: int = 10, timeout: Timeout = (3.05, 30.0),
+                 retry: Optional[RetryPolicy] = None, adaptive: bool = True,
+                 rate_limiter: Optional[TokenBucket] = None):
+        """
+        Initialize the transport
+        
+        Args:
+            pool_size: Maximum concurrent requests and pooled keep-alive connections
+            timeout: Default (connect, read) timeout in seconds for each attempt
+            retry: Retry policy (defaults to RetryPolicy())
+            adaptive: Shrink concurrency when the server throttles (AIMD); otherwise
+                pool_size requests may always be in flight
+            rate_limiter: Token bucket every attempt, retries included, draws from
+        """
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency = AdaptiveConcurrency(pool_size) if adaptive else None
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        if self.concurrency is None:
+            yield
+        else:
+            with self.concurrency.slot():
+                yield
+    
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[Timeout] = None, label: Optional[str] = None) -> requests.Response:
+        """
+        GET a URL, retrying throttled, failed and timed-out attempts
+        
+        Args:
+            url: Full URL
+            params: Query parameters
+            headers: Request headers
+            timeout: Per-request override of the default timeout
+            label: Endpoint name used in metrics
+        
+        Returns:
+            The final response; non-retryable errors (e.g. 404) and the last
+            failed attempt are returned for the caller to check
+        
+        Raises:
+            requests.ConnectionError, requests.Timeout: When the last attempt failed without a response
+        """
+        labels = {"endpoint": label or url}
+        attempt = 0
+        
+        while True:
+            if self.rate_limiter:
+                metrics.observe("rate_limit_wait_seconds", self.rate_limiter.acquire())
+            
+            response, error = None, None
+            with self._slot():
+                start = time.perf_counter()
+                try:
+                    response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as failure:
+                    error = failure
+                metrics.observe("http_request_seconds", time.perf_counter() - start, labels)
+            
+            status = response.status_code if response is not None else None
+            metrics.increment("http_requests", labels={**labels, "status": status or type(error).__name__})
+            
+            if status == 429 and self.concurrency is not None:
+                self.concurrency.on_throttle()
+            elif response is not None and status not in RetryPolicy.RETRY_STATUSES and self.concurrency is not None:
+                self.concurrency.on_success()
+            
+            if error is None and status not in RetryPolicy.RETRY_STATUSES:
+                return response
+            if not self.retry.should_retry(attempt, status):
+                if error is not None:
+                    raise error
+                return response
+            
+            retry_after = self.retry.parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+            metrics.increment("http_retries", labels={**labels, "reason": status or type(error).__name__})
+            # Back off outside the concurrency slot so other requests can use it
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
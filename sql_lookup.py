@@ -1,23 +1,23 @@
 import sqlite3
-import pandas as pd
+from storage.table_format import print_rows
 
 # Connect to the database
 conn = sqlite3.connect('movie_data.db')
 
-# Query the top 10 movies by weighted rating
+# Query the top 10 movies by weighted rating (from the materialized leaderboard)
 query = """
 SELECT title, release_year, vote_average, weighted_rating 
-FROM movies 
+FROM summary_top_rated 
 ORDER BY weighted_rating DESC 
 LIMIT 10
 """
 
-# Execute query and load results into a DataFrame
-df = pd.read_sql_query(query, conn)
+# Execute query (straight from the cursor, no pandas needed)
+cursor = conn.execute(query)
 
 # Display the results
 print("\nTop 10 Movies by Weighted Rating:")
-print(df)
+print_rows([column[0] for column in cursor.description], cursor.fetchall())
 
 # Close the connection
 conn.close()
@@ -0,0 +1,256 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+class _DBAPIConnection:
+    """
+    sqlite3-style execute/executemany on top of a pooled DB-API connection
+    
+    Queries are written with qmark (?) placeholders and translated to the
+    driver's paramstyle, so DatabaseConnector can use one SQL dialect.
+    """
+    
+    def __init__(self, raw_connection: Any, paramstyle: str):
+        self.raw_connection = raw_connection
+        self.paramstyle = paramstyle
+    
+    def translate(self, sql: str) -> str:
+        return translate_placeholders(sql, self.paramstyle)
+    
+    def execute(self, sql: str, params: Iterable = ()):
+        cursor = self.raw_connection.cursor()
+        cursor.execute(self.translate(sql), tuple(params))
+        return cursor
+    
+    def executemany(self, sql: str, rows: Iterable):
+        cursor = self.raw_connection.cursor()
+        cursor.executemany(self.translate(sql), list(rows))
+        return cursor
+    
+    def commit(self):
+        self.raw_connection.commit()
+    
+    def rollback(self):
+        self.raw_connection.rollback()
+    
+    def close(self):
+        self.raw_connection.close()  # Returns the connection to the SQLAlchemy pool
+
+
+def translate_placeholders(sql: str, paramstyle: str) -> str:
+    """
+    Rewrite qmark (?) placeholders for a DB-API paramstyle
+    
+    Args:
+        sql: Query using ? placeholders
+        paramstyle: Target DB-API paramstyle
+    
+    Returns:
+        Query using the target placeholders
+    """
+    if paramstyle == "qmark":
+        return sql
+    if paramstyle in ("format", "pyformat"):
+        return sql.replace("%", "%%").replace("?", "%s")
+    raise ValueError(f"Unsupported paramstyle: {paramstyle}")
+
+
+class ConnectionManager:
+    """
+    Small thread-safe connection pool with read-only readers and a single writer
+    
+    SQLite databases get a pool of read-only (URI mode=ro) reader connections
+    and one long-lived writer connection guarded by a lock. Any other
+    SQLAlchemy URL (e.g. postgresql://user@host/db) is served from a
+    SQLAlchemy engine pool instead.
+    """
+    
+    def __init__(self, database: str, pool_size: int = 4, pragmas: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the connection manager
+        
+        Args:
+            database: Path to a SQLite database file, or a SQLAlchemy URL
+            pool_size: Maximum number of concurrent reader connections
+            pragmas: PRAGMAs applied to the SQLite writer connection
+        """
+        self.database = database
+        self.pool_size = pool_size
+        self.pragmas = pragmas or {}
+        self.engine = None
+        self.sqlite_path = None
+        
+        if database.startswith("sqlite:///"):
+            self.sqlite_path = database[len("sqlite:///"):]
+        elif "://" in database:
+            from sqlalchemy import create_engine
+            self.engine = create_engine(database, pool_size=pool_size, pool_pre_ping=True)
+        else:
+            self.sqlite_path = database
+        
+        self.dialect = "sqlite" if self.engine is None else self.engine.dialect.name
+        self.paramstyle = "qmark" if self.engine is None else self.engine.dialect.paramstyle
+        # Raised by a query on a missing table: sqlite3's, or the engine driver's (e.g. psycopg2's ProgrammingError);
+        # errors is the base class of everything the driver raises (bad SQL included)
+        if self.engine is None:
+            self.missing_table_errors = (sqlite3.OperationalError,)
+            self.errors = (sqlite3.Error,)
+        else:
+            dbapi = self.engine.dialect.dbapi
+            self.missing_table_errors = (dbapi.ProgrammingError, dbapi.OperationalError)
+            self.errors = (dbapi.Error,)
+        
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._idle_readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(pool_size)
+        self._watcher = None
+        self._watch_lock = threading.Lock()
+        # An in-memory database only exists on the connection that created it
+        self._shared = self.sqlite_path == ":memory:"
+    
+    def translate(self, sql: str) -> str:
+        """
+        Rewrite a ? placeholder query for this database's driver
+        """
+        return translate_placeholders(sql, self.paramstyle)
+    
+    def _open_writer(self) -> sqlite3.Connection:
+        if self.sqlite_path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.sqlite_path))
+            os.makedirs(directory, exist_ok=True)
+        
+        # Transactions are managed explicitly so a whole load runs as one BEGIN ... COMMIT
+        conn = sqlite3.connect(self.sqlite_path, isolation_level=None, check_same_thread=False)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        path = os.path.abspath(self.sqlite_path)
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    
+    @contextmanager
+    def writer(self) -> Iterator[Any]:
+        """
+        Borrow the single writer connection (held exclusively for the block)
+        """
+        if self.engine is not None:
+            with self._write_lock:
+                conn = _DBAPIConnection(self.engine.raw_connection(), self.paramstyle)
+                try:
+                    yield conn
+                finally:
+                    conn.close()
+            return
+        
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            yield self._writer
+    
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Run the block in a single write transaction, rolled back on error
+        """
+        with self.writer() as conn:
+            if self.engine is not None:
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                return
+            
+            conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    @contextmanager
+    def reader(self) -> Iterator[Any]:
+        """
+        Borrow a read-only connection from the pool
+        
+        Blocks when pool_size readers are already in use.
+        """
+        if self.engine is not None:
+            conn = _DBAPIConnection(self.engine.raw_connection(), self.paramstyle)
+            try:
+                yield conn
+            finally:
+                conn.rollback()  # End the implicit read transaction before returning it to the pool
+                conn.close()
+            return
+        
+        if self._shared or not os.path.exists(self.sqlite_path):
+            # Nothing to open read-only yet, so read through the writer
+            with self.writer() as conn:
+                yield conn
+            return
+        
+        with self._reader_slots:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except queue.Empty:
+                conn = self._open_reader()
+            try:
+                yield conn
+            finally:
+                self._idle_readers.put(conn)
+    
+    def data_version(self) -> Optional[int]:
+        """
+        SQLite's PRAGMA data_version, read on a dedicated connection
+        
+        The value changes whenever any other connection, in this process
+        or another, commits to the database, so a reader can tell that
+        cached results are stale without re-running its queries.
+        
+        Returns:
+            The current data version, or None for non-SQLite and in-memory
+            databases and before the database file exists
+        """
+        if self.engine is not None or self._shared or not os.path.exists(self.sqlite_path):
+            return None
+        with self._watch_lock:
+            if self._watcher is None:
+                self._watcher = self._open_reader()
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self):
+        """
+        Close every pooled connection
+        """
+        with self._watch_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        
+        while True:
+            try:
+                self._idle_readers.get_nowait().close()
+            except queue.Empty:
+                break
+        
+        if self.engine is not None:
+            self.engine.dispose()
+    
+    def __enter__(self) -> "ConnectionManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
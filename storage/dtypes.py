@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE: Any = "string[pyarrow]"
+except ImportError:  # Optional: without pyarrow, text stays as object (python-backed "string" saves nothing)
+    STRING_DTYPE = object
+
+# Column dtypes of the movie frame, shared by DataTransformer output and DatabaseConnector.get_movies
+MOVIE_DTYPES: Dict[str, Any] = {
+    "id": "int32",
+    "title": STRING_DTYPE,
+    "original_title": STRING_DTYPE,
+    "overview": STRING_DTYPE,
+    "popularity": "float32",
+    "vote_average": "float32",
+    "vote_count": "Int32",
+    "release_date": "datetime64[ns]",
+    "release_year": "Int16",
+    "genres": "category",
+    "adult": "bool",
+    "poster_path": STRING_DTYPE,
+    "backdrop_path": STRING_DTYPE,
+    "original_language": "category",
+    "weighted_rating": "float32",
+    "has_english_title": "bool",
+    "title_length": "Int16",
+    "overview_length": "Int32",
+}
+
+def apply_dtypes(df: pd.DataFrame, dtypes: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Convert the frame's columns to the schema's compact dtypes, in place
+    
+    Columns missing from the frame or already of the right dtype are left
+    alone, so applying the schema twice costs nothing.
+    
+    Args:
+        df: Movie DataFrame (e.g. from process_movies or read back from the database)
+        dtypes: Column to dtype mapping (defaults to MOVIE_DTYPES)
+    
+    Returns:
+        The same DataFrame
+    """
+    for column, dtype in (dtypes or MOVIE_DTYPES).items():
+        if column not in df or df[column].dtype == dtype:
+            continue
+        series = df[column]
+        if dtype == "bool":
+            # Read back from SQLite as 0/1 integers, possibly NULL
+            series = series.fillna(False)
+        elif str(dtype).startswith("datetime64") and not pd.api.types.is_datetime64_dtype(series):
+            df[column] = pd.to_datetime(series, format="%Y-%m-%d", errors="coerce")
+            continue
+        df[column] = series.astype(dtype)
+    return df
+
+def float32_to_float64(values: np.ndarray) -> np.ndarray:
+    """
+    Widen float32 values to the float64 of their shortest decimal form
+    
+    A plain cast turns 7.3 into 7.300000190734863; rounding to the fewest
+    significant digits (7 to 9) that still round-trip to the same float32
+    gives back 7.3, like repr() but vectorized.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    wide = values.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.ceil(np.log10(np.abs(wide)))
+    magnitude = np.where(np.isfinite(magnitude), magnitude, 0)
+    
+    result = wide.copy()
+    pending = np.isfinite(wide)
+    for digits in (7, 8, 9):
+        scale = 10.0 ** (digits - magnitude[pending])
+        rounded = np.round(wide[pending] * scale) / scale
+        exact = rounded.astype(np.float32) == values[pending]
+        positions = np.flatnonzero(pending)
+        result[positions[exact]] = rounded[exact]
+        pending[positions[exact]] = False
+        if not pending.any():
+            break
+    return result
@@ -0,0 +1,240 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+class RunJournal:
+    """
+    Journal of harvest runs with their fetched payloads spooled to disk
+    
+    Every fetched batch (a page of popular movies, a batch of movie details)
+    is written to <spool_dir>/<run_id>/<kind>/<key>.json.gz and then recorded
+    as complete in a small SQLite journal, so a run that dies part-way can
+    be resumed without fetching any of that work again. The journal tracks
+    one run at a time, chosen with start().
+    """
+    
+    def __init__(self, spool_dir: str = ".spool"):
+        """
+        Initialize the journal
+        
+        Args:
+            spool_dir: Directory holding journal.db and the spooled payloads
+        """
+        self.spool_dir = spool_dir
+        self.run_id = None
+        self.started_at = None
+        self.resumed = False
+        os.makedirs(spool_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(spool_dir, "journal.db"), isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            source TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            status TEXT,
+            options TEXT
+        )
+        ''')
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS run_stages (
+            run_id TEXT,
+            stage TEXT,
+            status TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (run_id, stage)
+        )
+        ''')
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS run_items (
+            run_id TEXT,
+            kind TEXT,
+            item INTEGER,
+            spool_key INTEGER,
+            PRIMARY KEY (run_id, kind, item)
+        )
+        ''')
+    
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+    
+    def find_resumable(self, source: str, run_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Find the given run, or the latest unfinished run of the source
+        
+        Returns:
+            Dictionary with run_id, started_at, status and options, or None
+        """
+        query = "SELECT run_id, started_at, status, options FROM runs WHERE source = ? AND status != 'completed'"
+        params = (source,)
+        if run_id is not None:
+            query += " AND run_id = ?"
+            params += (run_id,)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY started_at DESC, run_id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        return {"run_id": row[0], "started_at": row[1], "status": row[2], "options": json.loads(row[3])}
+    
+    def start(self, source: str, options: Optional[Dict] = None, resume: bool = False,
+              run_id: Optional[str] = None) -> str:
+        """
+        Start a new run, or pick up an unfinished one
+        
+        A resumed run keeps its original start time (self.started_at), so a
+        watermark saved at its end still covers changes made before the resume.
+        
+        Args:
+            source: Name of the harvested source
+            options: Run options worth recording (e.g. pages); a resumed run must have been started with the same
+            resume: Continue the latest unfinished run of the source, if there is one
+            run_id: Specific unfinished run to continue (implies resume)
+        
+        Returns:
+            The run ID, also kept in self.run_id
+        
+        Raises:
+            ValueError: If run_id names no unfinished run of the source, or the
+                run to resume was started with different options
+        """
+        previous = self.find_resumable(source, run_id) if resume or run_id else None
+        if run_id is not None and previous is None:
+            raise ValueError(f"No unfinished {source} run with ID {run_id}")
+        if previous is not None:
+            # Options missing from the journal (recorded by an older version) aren't compared
+            mismatched = [f"{key}={previous['options'][key]!r} (now {value!r})"
+                          for key, value in (options or {}).items()
+                          if key in previous["options"] and previous["options"][key] != value]
+            if mismatched:
+                raise ValueError(f"Run {previous['run_id']} was started with {', '.join(mismatched)}; resume it "
+                                 f"with the same options, or start a new run without --resume")
+        
+        with self._lock:
+            if previous is not None:
+                self.run_id, self.started_at, self.resumed = previous["run_id"], previous["started_at"], True
+                self._conn.execute("UPDATE runs SET status = 'running', finished_at = NULL WHERE run_id = ?",
+                                   (self.run_id,))
+            else:
+                self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:6]
+                self.started_at = self._now()
+                self.resumed = False
+                self._conn.execute(
+                    "INSERT INTO runs (run_id, source, started_at, status, options) VALUES (?, ?, ?, 'running', ?)",
+                    (self.run_id, source, self.started_at, json.dumps(options or {}))
+                )
+        return self.run_id
+    
+    def finish(self, status: str = "completed", purge: bool = True):
+        """
+        Record how the run ended
+        
+        Args:
+            status: "completed" or "failed"
+            purge: Delete the spooled payloads once the run has completed
+        """
+        with self._lock:
+            self._conn.execute("UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?",
+                               (status, self._now(), self.run_id))
+        if status == "completed" and purge:
+            shutil.rmtree(os.path.join(self.spool_dir, self.run_id), ignore_errors=True)
+    
+    def stage_done(self, stage: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM run_stages WHERE run_id = ? AND stage = ?",
+                                     (self.run_id, stage)).fetchone()
+        return row is not None and row[0] == "done"
+    
+    def mark_stage(self, stage: str, status: str = "done"):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO run_stages (run_id, stage, status, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(run_id, stage) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at",
+                (self.run_id, stage, status, self._now())
+            )
+    
+    def completed_items(self, kind: str) -> Set[int]:
+        """
+        Get the items (page numbers, movie IDs) whose payloads are already spooled
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT item FROM run_items WHERE run_id = ? AND kind = ?",
+                                      (self.run_id, kind))
+            return {row[0] for row in rows}
+    
+    def _spool_path(self, kind: str, key: int) -> str:
+        return os.path.join(self.spool_dir, self.run_id, kind, f"{key:08d}.json.gz")
+    
+    def spool(self, kind: str, key: int, payload: Any, items: Iterable[int] = ()) -> Any:
+        """
+        Write a payload to the spool and mark its items complete
+        
+        The file is written under a temporary name and renamed, and the items
+        are only recorded afterwards, so a crash never leaves a completed
+        item without its payload.
+        
+        Args:
+            kind: Payload kind (e.g. "page", "details")
+            key: Spool file number, unique per kind
+            payload: JSON-serializable payload
+            items: Items the payload completes (defaults to [key])
+        
+        Returns:
+            The payload
+        """
+        path = self._spool_path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8", compresslevel=5) as spool_file:
+            json.dump(payload, spool_file)
+        os.replace(path + ".tmp", path)
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO run_items (run_id, kind, item, spool_key) VALUES (?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                [(self.run_id, kind, int(item), key) for item in (list(items) or [key])]
+            )
+        return payload
+    
+    def load(self, kind: str, key: int) -> Any:
+        """
+        Read back one spooled payload
+        """
+        with gzip.open(self._spool_path(kind, key), "rt", encoding="utf-8") as spool_file:
+            return json.load(spool_file)
+    
+    def next_spool_key(self, kind: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(spool_key) FROM run_items WHERE run_id = ? AND kind = ?",
+                                     (self.run_id, kind)).fetchone()
+        return (row[0] or 0) + 1
+    
+    def iter_spooled(self, kind: str, items: Optional[Iterable[int]] = None) -> Iterator[Any]:
+        """
+        Read back the spooled payloads of a kind, in key order
+        
+        Args:
+            kind: Payload kind
+            items: Only read payloads completing at least one of these items
+        """
+        query = "SELECT DISTINCT spool_key FROM run_items WHERE run_id = ? AND kind = ?"
+        params = (self.run_id, kind)
+        if items is not None:
+            query += " AND item IN (SELECT value FROM json_each(?))"
+            params += (json.dumps([int(item) for item in items]),)
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute(query + " ORDER BY spool_key", params)]
+        for key in keys:
+            yield self.load(kind, key)
+    
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,202 @@
+import glob
+import gzip
+import io
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: Parquet landing files
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd-compressed JSONL
+    zstandard = None
+
+FORMATS = ("parquet", "jsonl.zst", "jsonl.gz")
+
+def default_format() -> str:
+    """
+    Best landing format the installed packages support: Parquet, then JSONL.zst, then JSONL.gz
+    """
+    if pq is not None:
+        return "parquet"
+    if zstandard is not None:
+        return "jsonl.zst"
+    return "jsonl.gz"
+
+class LandingZone:
+    """
+    Append-only store of raw API payloads, partitioned by endpoint and run date
+    
+    Records land in <root>/<endpoint>/date=YYYY-MM-DD/<run_id>-NNNNN.<format>,
+    one file per flush of rows_per_file records. Nothing is ever rewritten,
+    so the transform and load stages can be replayed over any date range
+    without touching the API.
+    """
+    
+    def __init__(self, root: str = "landing", run_id: Optional[str] = None, file_format: Optional[str] = None,
+                 rows_per_file: int = 50000):
+        """
+        Initialize the landing zone
+        
+        Args:
+            root: Root directory of the landing zone
+            run_id: Prefix of the files this run writes (defaults to a timestamp)
+            file_format: One of FORMATS (defaults to default_format())
+            rows_per_file: Records buffered per endpoint before a file is written
+        """
+        file_format = file_format or default_format()
+        if file_format not in FORMATS:
+            raise ValueError(f"Unknown landing format {file_format!r}, expected one of {FORMATS}")
+        if file_format == "parquet" and pq is None:
+            raise ValueError("The parquet landing format requires pyarrow")
+        if file_format == "jsonl.zst" and zstandard is None:
+            raise ValueError("The jsonl.zst landing format requires zstandard")
+        
+        self.root = root
+        self.file_format = file_format
+        self.rows_per_file = rows_per_file
+        self.run_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self._buffers = {}
+        self._parts = {}
+        self._lock = threading.Lock()
+    
+    def append(self, endpoint: str, records: Iterable[Dict]):
+        """
+        Buffer raw records of an endpoint, writing a file whenever rows_per_file are buffered
+        """
+        with self._lock:
+            buffer = self._buffers.setdefault(endpoint, [])
+            buffer.extend(records)
+            if len(buffer) >= self.rows_per_file:
+                self._flush(endpoint)
+    
+    def flush(self):
+        """
+        Write every buffered record to disk
+        """
+        with self._lock:
+            for endpoint in list(self._buffers):
+                self._flush(endpoint)
+    
+    close = flush
+    
+    def _flush(self, endpoint: str):
+        records = self._buffers.pop(endpoint, [])
+        if not records:
+            return
+        
+        directory = os.path.join(self.root, endpoint, f"date={self.run_date}")
+        os.makedirs(directory, exist_ok=True)
+        # A resumed run keeps its run ID: continue after the parts it already wrote
+        part = self._parts.get(endpoint, 0)
+        while True:
+            part += 1
+            path = os.path.join(directory, f"{self.run_id}-{part:05d}.{self.file_format}")
+            if not os.path.exists(path):
+                break
+        self._parts[endpoint] = part
+        
+        # Write under a temporary name so readers never see a partial file
+        if self.file_format == "parquet":
+            pq.write_table(self._to_table(records), path + ".tmp", compression="zstd")
+        else:
+            with open(path + ".tmp", "wb") as raw_file:
+                if self.file_format == "jsonl.zst":
+                    stream = zstandard.ZstdCompressor(level=3).stream_writer(raw_file)
+                else:
+                    stream = gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=5)
+                with stream:
+                    for record in records:
+                        stream.write(json.dumps(record).encode("utf-8") + b"\n")
+        os.replace(path + ".tmp", path)
+    
+    @staticmethod
+    def _to_table(records: List[Dict]) -> "pa.Table":
+        # Table.from_pylist takes its columns from the first record alone, silently dropping keys
+        # only later records have, so records become columns only when they all share their keys
+        keys = records[0].keys()
+        if keys and all(record.keys() == keys for record in records):
+            try:
+                # Each column's type is inferred from all of its values
+                return pa.table({key: [record[key] for record in records] for key in keys})
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        # Keys or field types that vary between records: keep each payload as a JSON string
+        return pa.table({"payload": [json.dumps(record) for record in records]})
+    
+    def partitions(self, endpoints: Sequence[str], since: Optional[str] = None,
+                   until: Optional[str] = None) -> List[str]:
+        """
+        List the landed files of one or more endpoints, oldest first
+        
+        Args:
+            endpoints: Endpoint names (e.g. ["popular"]); files of the same run
+                are ordered as the endpoints are listed
+            since: First run date to include (YYYY-MM-DD)
+            until: Last run date to include (YYYY-MM-DD)
+        """
+        keyed = []
+        for rank, endpoint in enumerate(endpoints):
+            for path in glob.glob(os.path.join(self.root, endpoint, "date=*", "*")):
+                if not path.endswith(FORMATS):
+                    continue
+                run_date = os.path.basename(os.path.dirname(path))[len("date="):]
+                if (since is None or run_date >= since) and (until is None or run_date <= until):
+                    run_id, part = os.path.basename(path).split(".")[0].rsplit("-", 1)
+                    keyed.append(((run_date, run_id, rank, int(part)), path))
+        return [path for _, path in sorted(keyed)]
+    
+    @staticmethod
+    def read_file(path: str) -> Iterator[Dict]:
+        """
+        Read back the records of one landed file (Parquet files are memory-mapped)
+        """
+        if path.endswith(".parquet"):
+            if pq is None:
+                raise ValueError(f"Reading {path} requires pyarrow")
+            table = pq.read_table(path, memory_map=True)
+            if table.column_names == ["payload"]:
+                yield from (json.loads(payload) for payload in table.column("payload").to_pylist())
+            else:
+                yield from table.to_pylist()
+            return
+        
+        with open(path, "rb") as raw_file:
+            if path.endswith(".zst"):
+                if zstandard is None:
+                    raise ValueError(f"Reading {path} requires zstandard")
+                stream = zstandard.ZstdDecompressor().stream_reader(raw_file)
+            else:
+                stream = gzip.GzipFile(fileobj=raw_file, mode="rb")
+            with io.BufferedReader(stream) as lines:
+                for line in lines:
+                    yield json.loads(line)
+    
+    def iter_records(self, endpoints: Sequence[str], since: Optional[str] = None,
+                     until: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Read back every landed record of the endpoints, oldest first
+        """
+        for path in self.partitions(endpoints, since, until):
+            yield from self.read_file(path)
+    
+    def latest_by_id(self, endpoints: Sequence[str], since: Optional[str] = None,
+                     until: Optional[str] = None) -> List[Dict]:
+        """
+        Latest landed version of every record of the endpoints, keyed by its "id"
+        
+        Returns:
+            List of records, ordered by first appearance
+        """
+        latest: Dict[Any, Dict] = {}
+        for record in self.iter_records(endpoints, since, until):
+            latest[record["id"]] = record
+        return list(latest.values())
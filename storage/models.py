@@ -1,7 +1,57 @@
-class Movie:
+import inspect
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+class Record:
+    """
+    Base of the slotted record types
+    
+    Records keep their fields in __slots__ rather than a per-instance
+    __dict__, so millions of them can be held or streamed cheaply.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def row_factory(cls, columns: Sequence[str]) -> Callable[[Any, Tuple], "Record"]:
+        """
+        Build a sqlite3 row_factory that turns rows of the given columns into records
+        
+        Args:
+            columns: Column names of the rows, each one a field of the record;
+                fields not selected keep their defaults
+        
+        Returns:
+            Callable taking (cursor, row) and returning a record
+        
+        Raises:
+            ValueError: If a column is not a field of the record, or a required field is not selected
+        """
+        columns = tuple(columns)
+        unknown = [column for column in columns if column not in cls.__slots__]
+        if unknown:
+            raise ValueError(f"Unknown {cls.__name__} fields: {', '.join(unknown)}")
+        required = [name for name, parameter in inspect.signature(cls).parameters.items()
+                    if parameter.default is inspect.Parameter.empty and name not in columns]
+        if required:
+            raise ValueError(f"Required {cls.__name__} fields not selected: {', '.join(required)}")
+        
+        # Rows holding a leading run of the fields in order map straight onto the positional arguments
+        if columns == cls.__slots__[:len(columns)]:
+            return lambda cursor, row: cls(*row)
+        return lambda cursor, row: cls(**dict(zip(columns, row)))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class Movie(Record):
     """
     Represents a movie in the database
     """
+    __slots__ = (
+        "id", "title", "original_title", "overview", "popularity", "vote_average", "vote_count",
+        "release_date", "release_year", "genres", "adult", "poster_path", "backdrop_path",
+        "original_language", "weighted_rating", "has_english_title", "title_length", "overview_length"
+    )
     
     def __init__(
         self,
@@ -19,7 +69,10 @@ class Movie:
         poster_path: str = None,
         backdrop_path: str = None,
         original_language: str = None,
-        weighted_rating: float = None
+        weighted_rating: float = None,
+        has_english_title: bool = None,
+        title_length: int = None,
+        overview_length: int = None
     ):
         self.id = id
         self.title = title
@@ -36,15 +89,19 @@ class Movie:
         self.backdrop_path = backdrop_path
         self.original_language = original_language
         self.weighted_rating = weighted_rating
+        self.has_english_title = has_english_title
+        self.title_length = title_length
+        self.overview_length = overview_length
     
     def __repr__(self):
         return f"<Movie {self.id}: {self.title}>"
 
 
-class Genre:
+class Genre(Record):
     """
     Represents a movie genre
     """
+    __slots__ = ("id", "name")
     
     def __init__(self, id: int, name: str):
         self.id = id
@@ -0,0 +1,65 @@
+import json
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from storage.dtypes import apply_dtypes
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: Parquet processed files
+    pa = pq = None
+
+# Schema metadata key of the genre list in a processed Parquet file
+GENRES_METADATA_KEY = b"dataharvester.genres"
+
+def write_processed_movies(movies_df: pd.DataFrame, genres: List[Dict], path: str):
+    """
+    Write a processed movies file together with the TMDB genre list 'load' stores
+    
+    Parquet files carry the genres as schema metadata (pandas does not
+    write DataFrame.attrs to Parquet); pickles keep them in the frame's attrs.
+    
+    Args:
+        movies_df: Processed movie DataFrame
+        genres: Genre dictionaries with id and name
+        path: .parquet (needs pyarrow), else a pickle (.pkl, .pkl.gz)
+    """
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ValueError("Parquet processed files require pyarrow")
+        table = pa.Table.from_pandas(movies_df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[GENRES_METADATA_KEY] = json.dumps(genres).encode("utf-8")
+        pq.write_table(table.replace_schema_metadata(metadata), path)
+    else:
+        movies_df = movies_df.copy(deep=False)
+        movies_df.attrs["genres"] = genres
+        movies_df.to_pickle(path)
+
+def read_processed_movies(path: str) -> Tuple[pd.DataFrame, List[Dict]]:
+    """
+    Read a processed movies file written by write_processed_movies
+    
+    Returns:
+        Tuple of (movie DataFrame, genre dictionaries)
+    
+    Raises:
+        ValueError: If the file holds no genre list (e.g. written by an older version)
+    """
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ValueError("Parquet processed files require pyarrow")
+        table = pq.read_table(path)
+        raw_genres = (table.schema.metadata or {}).get(GENRES_METADATA_KEY)
+        genres = json.loads(raw_genres) if raw_genres is not None else None
+        # Text columns come back python-backed; restore the schema's dtypes
+        movies_df = apply_dtypes(table.to_pandas())
+    else:
+        movies_df = pd.read_pickle(path)
+        genres = movies_df.attrs.pop("genres", None)
+    
+    if not genres:
+        raise ValueError(f"{path} holds no genre list; re-create it with 'transform'")
+    return movies_df, genres
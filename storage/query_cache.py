@@ -0,0 +1,159 @@
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+class QueryCache:
+    """
+    LRU cache of query results, tagged with the data version they were read at
+    
+    Entries are keyed by the normalized query text and its parameters. A
+    lookup only hits when the entry's version equals the current one, so
+    any write (which changes the version) invalidates every cached result
+    at once. With a path, results are also pickled to a SQLite file so a
+    later process reading the same, unchanged database can reuse them;
+    disk entries are matched on the version's persistent part only.
+    """
+    
+    def __init__(self, database: str, max_entries: int = 128, path: Optional[str] = None):
+        """
+        Args:
+            database: Path or URL of the database whose results are cached
+                (one cache file can serve several databases)
+            max_entries: Results kept in memory (and on disk, per database) before the least recently used is dropped
+            path: Optional SQLite file to persist results in
+        """
+        self.database = database
+        self.max_entries = max(1, max_entries)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                database TEXT,
+                key TEXT,
+                version TEXT,
+                body BLOB,
+                last_access REAL,
+                PRIMARY KEY (database, key)
+            )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access)")
+            self._conn.commit()
+    
+    @staticmethod
+    def make_key(kind: str, query: str, params: Sequence = ()) -> str:
+        """
+        Build a cache key from the kind of result (e.g. "frame" or "rows"), the query
+        with its whitespace collapsed and the bound parameters
+        """
+        return json.dumps([kind, " ".join(query.split()), list(params)], default=str, separators=(",", ":"))
+    
+    def get_or_load(self, key: str, version: Tuple[Optional[str], Hashable], load: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key at version, or load, cache and return it
+        
+        Args:
+            key: Key from make_key
+            version: Tuple of (persistent write version or None, any process-local version part);
+                disk entries are only used when the persistent part is known
+            load: Runs the query on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        
+        result = self._load_from_disk(key, version[0])
+        if result is None:
+            with self._lock:
+                self.misses += 1
+            result = load()
+            self._save_to_disk(key, version[0], result)
+        else:
+            with self._lock:
+                self.hits += 1
+        
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+    
+    def _load_from_disk(self, key: str, version: Optional[str]) -> Any:
+        if self._conn is None or version is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM results WHERE database = ? AND key = ? AND version = ?",
+                                     (self.database, key, version)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE results SET last_access = ? WHERE database = ? AND key = ?",
+                               (time.time(), self.database, key))
+            self._conn.commit()
+        return pickle.loads(row[0])
+    
+    def _save_to_disk(self, key: str, version: Optional[str], result: Any):
+        if self._conn is None or version is None:
+            return
+        body = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            # Results of older versions can never hit again
+            self._conn.execute("DELETE FROM results WHERE database = ? AND version <> ?", (self.database, version))
+            self._conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                               (self.database, key, version, body, time.time()))
+            self._conn.execute("""
+            DELETE FROM results WHERE database = ? AND key IN (
+                SELECT key FROM results WHERE database = ? ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """, (self.database, self.database, self.max_entries))
+            self._conn.commit()
+    
+    def clear(self):
+        """
+        Drop every cached result of this database, in memory and on disk
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results WHERE database = ?", (self.database,))
+                self._conn.commit()
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters, used to size the cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
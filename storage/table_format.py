@@ -0,0 +1,11 @@
+from typing import List
+
+def print_rows(columns: List[str], rows: List[tuple]):
+    """
+    Print query results as an aligned text table
+    """
+    cells = [[f"{value:.2f}" if isinstance(value, float) else str(value) for value in row] for row in rows]
+    widths = [max([len(column)] + [len(row[position]) for row in cells]) for position, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+    for row in cells:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
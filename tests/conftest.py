@@ -0,0 +1,29 @@
+import contextlib
+import io
+
+import pytest
+
+from benchmarks.stub_server import GENRES, fake_movie
+from processor.transformer import DataTransformer
+from storage.db_connector import DatabaseConnector
+
+
+@pytest.fixture
+def movies_df():
+    """
+    Processed frame of 50 stub movies
+    """
+    return DataTransformer().process_movies([fake_movie(movie_id) for movie_id in range(1, 51)], GENRES)
+
+
+@pytest.fixture
+def db_path(tmp_path, movies_df):
+    """
+    SQLite database holding the stub genres and movies_df
+    """
+    path = str(tmp_path / "movies.db")
+    with DatabaseConnector(path) as db, contextlib.redirect_stdout(io.StringIO()):
+        db.create_tables()
+        db.store_genres(GENRES)
+        db.store_movies(movies_df)
+    return path
@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.bench_import_time import COMMANDS, HEAVY_MODULES, import_profile, make_environment
+from main import main
+
+
+@pytest.mark.parametrize("command", COMMANDS, ids=" ".join)
+def test_quick_commands_skip_heavy_imports(tmp_path, command):
+    _, modules = import_profile(command, make_environment(str(tmp_path)))
+    
+    assert not modules & set(HEAVY_MODULES)
+
+
+@pytest.fixture
+def database(db_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", db_path)
+    return db_path
+
+
+def test_query_prints_rows(database, capsys):
+    assert main(["query", "sql", "SELECT COUNT(*) AS movies FROM movies"]) == 0
+    assert capsys.readouterr().out.split() == ["movies", "50"]
+
+
+def test_query_missing_database_is_not_created(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "missing.db"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", str(db_path))
+    
+    assert main(["query", "top"]) == 1
+    assert "not found" in capsys.readouterr().out
+    assert not db_path.exists()
+
+
+@pytest.mark.parametrize("command", [
+    ["query", "sql", "SELEC title FROM movies"],
+    ["query", "sql", "SELECT * FROM no_such_table"],
+    ["query", "search", "--raw", 'title:"unterminated'],
+])
+def test_query_reports_database_errors(database, capsys, command):
+    assert main(command) == 1
+    assert capsys.readouterr().out.startswith("Error: ")
@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+
+import pytest
+
+from scraper.data_collector import MovieDataCollector
+
+
+class FakeChangesAPI:
+    """
+    Records the date windows of /movie/changes queries, answering two pages each
+    """
+    MAX_CHANGES_DAYS = 14
+    
+    def __init__(self):
+        self.windows = []
+    
+    def get_movie_changes(self, start_date: str, end_date: str, page: int = 1):
+        if page == 1:
+            self.windows.append((start_date, end_date))
+        return {"results": [{"id": len(self.windows) * 10 + page}], "total_pages": 2}
+
+
+@pytest.fixture
+def collector():
+    collector = MovieDataCollector("test-key")
+    collector.api = FakeChangesAPI()
+    return collector
+
+
+def test_windows_cover_the_range_once(collector):
+    changed = collector.get_changed_movie_ids("2024-01-01", "2024-02-15")
+    
+    assert collector.api.windows == [
+        ("2024-01-01", "2024-01-14"),
+        ("2024-01-15", "2024-01-28"),
+        ("2024-01-29", "2024-02-11"),
+        ("2024-02-12", "2024-02-15"),
+    ]
+    assert changed == {11, 12, 21, 22, 31, 32, 41, 42}
+
+
+@pytest.mark.parametrize("days", [1, 13, 14, 15, 28, 29, 100])
+def test_windows_are_contiguous_and_at_most_14_days(collector, days):
+    first = date(2024, 3, 1)
+    last = first + timedelta(days=days - 1)
+    collector.get_changed_movie_ids(first.isoformat(), last.isoformat())
+    
+    windows = [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in collector.api.windows]
+    assert windows[0][0] == first and windows[-1][1] == last
+    assert all((end - start).days + 1 <= 14 for start, end in windows)
+    assert all(start == previous_end + timedelta(days=1)
+               for (_, previous_end), (start, _) in zip(windows, windows[1:]))
+
+
+def test_single_day(collector):
+    collector.get_changed_movie_ids("2024-05-05", "2024-05-05")
+    
+    assert collector.api.windows == [("2024-05-05", "2024-05-05")]
@@ -0,0 +1,39 @@
+import contextlib
+import io
+
+from storage.db_connector import DatabaseConnector
+
+
+def test_upsert_is_idempotent(db_path, movies_df):
+    with DatabaseConnector(db_path) as db:
+        links = db.query_rows("SELECT COUNT(*) FROM movie_genres", cache=False)[1]
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.upsert_movies(movies_df)
+        
+        assert db.query_rows("SELECT COUNT(*) FROM movies", cache=False)[1] == [(50,)]
+        assert db.query_rows("SELECT COUNT(*) FROM movie_genres", cache=False)[1] == links
+        # One link per distinct genre (the stub repeats some genre ids)
+        assert links == [(sum(len(set(genres)) for genres in movies_df["genre_list"]),)]
+
+
+def test_movies_by_genre_follow_the_genre_ids(db_path, movies_df):
+    with DatabaseConnector(db_path) as db:
+        ids = set(db.get_movies_by_genre("Comedy")["id"])
+    
+    assert ids == {movie_id for movie_id, genres in zip(movies_df["id"], movies_df["genre_list"])
+                   if "Comedy" in genres}
+
+
+def test_summaries_stay_consistent_after_an_upsert(db_path, movies_df):
+    with DatabaseConnector(db_path) as db:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.upsert_movies(movies_df.head(5).assign(vote_average=1.0, release_year=1990))
+        
+        assert set(db.check_summaries().values()) == {0}
+
+
+def test_search_ranks_the_exact_title_first(db_path):
+    with DatabaseConnector(db_path) as db:
+        columns, rows = db.search_rows("movie 3", limit=5)
+    
+    assert rows[0][columns.index("id")] == 3
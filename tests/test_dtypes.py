@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from benchmarks.bench_dtypes import bytes_per_row
+from benchmarks.bench_transformer import make_raw_movies, process_movies_legacy
+from benchmarks.stub_server import GENRES, fake_movie
+from processor.transformer import DataTransformer
+from storage.dtypes import STRING_DTYPE, float32_to_float64
+from storage.models import Genre, Movie
+
+
+def test_schema_memory_reduction():
+    movies = make_raw_movies(20000)
+    before = bytes_per_row(process_movies_legacy(movies, GENRES)).sum()
+    after = bytes_per_row(DataTransformer().process_movies(movies, GENRES)).sum()
+    
+    # Text stays object without pyarrow, so only the numeric and categorical columns shrink
+    assert before / after >= (3.0 if STRING_DTYPE != object else 1.4)
+
+
+def test_movies_without_id_are_dropped(capsys):
+    movies = [fake_movie(movie_id) for movie_id in range(1, 6)]
+    movies[1]["id"] = None
+    del movies[3]["id"]
+    
+    df = DataTransformer().process_movies(movies, GENRES)
+    
+    assert df["id"].tolist() == [1, 3, 5]
+    assert df.index.equals(pd.RangeIndex(3))
+    assert "Dropped 2 movies without an id" in capsys.readouterr().out
+
+
+def test_documented_dtype_changes():
+    movies = [fake_movie(movie_id) for movie_id in range(1, 4)]
+    movies[0]["vote_average"] = 7.3
+    movies[1]["original_language"] = None
+    movies[2]["release_date"] = ""
+    
+    df = DataTransformer().process_movies(movies, GENRES)
+    
+    assert (df["id"].dtype, df["vote_average"].dtype, df["release_year"].dtype) == ("int32", "float32", "Int16")
+    assert df["vote_average"].iloc[0] != 7.3
+    assert float32_to_float64(df["vote_average"].to_numpy())[0] == 7.3
+    assert pd.isna(df["original_language"].iloc[1])
+    assert df["release_year"].iloc[2] is pd.NA
+
+
+def test_movie_and_genre_require_their_keys():
+    with pytest.raises(TypeError):
+        Movie()
+    with pytest.raises(TypeError):
+        Genre(id=1)
+    with pytest.raises(ValueError, match="title"):
+        Movie.row_factory(["id", "release_year"])
+    
+    make_movie = Movie.row_factory(["id", "title", "release_year"])
+    assert make_movie(None, (1, "Movie 1", 1999)).to_dict()["release_year"] == 1999
@@ -0,0 +1,51 @@
+import pytest
+
+from storage.journal import RunJournal
+
+OPTIONS = {"pages": 5, "incremental": False, "details": True}
+
+
+@pytest.fixture
+def failed_run(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    journal.start("tmdb_popular", OPTIONS)
+    journal.spool("page", 1, {"results": [{"id": 1}]})
+    journal.finish("failed")
+    journal.close()
+    return journal
+
+
+def test_resume_keeps_run_and_start_time(tmp_path, failed_run):
+    journal = RunJournal(str(tmp_path))
+    journal.start("tmdb_popular", dict(OPTIONS), resume=True)
+    
+    assert journal.resumed
+    assert journal.run_id == failed_run.run_id
+    assert journal.started_at == failed_run.started_at
+    assert journal.completed_items("page") == {1}
+    assert journal.load("page", 1) == {"results": [{"id": 1}]}
+
+
+@pytest.mark.parametrize("changed", [{"pages": 10}, {"details": False}])
+def test_resume_rejects_changed_options(tmp_path, failed_run, changed):
+    journal = RunJournal(str(tmp_path))
+    
+    with pytest.raises(ValueError, match=failed_run.run_id):
+        journal.start("tmdb_popular", dict(OPTIONS, **changed), resume=True)
+
+
+def test_new_run_is_not_resumed(tmp_path, failed_run):
+    journal = RunJournal(str(tmp_path))
+    journal.start("tmdb_popular", dict(OPTIONS, pages=10))
+    
+    assert not journal.resumed
+    assert journal.run_id != failed_run.run_id
+
+
+def test_completed_run_is_not_resumed(tmp_path, failed_run):
+    journal = RunJournal(str(tmp_path))
+    journal.start("tmdb_popular", OPTIONS, resume=True)
+    journal.finish()
+    
+    journal.start("tmdb_popular", OPTIONS, resume=True)
+    assert not journal.resumed
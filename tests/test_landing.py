@@ -0,0 +1,57 @@
+import pytest
+
+from benchmarks.stub_server import fake_credits, fake_details, fake_movie
+from storage import landing
+from storage.landing import LandingZone
+
+FORMATS = [
+    pytest.param("parquet", marks=pytest.mark.skipif(landing.pq is None, reason="needs pyarrow")),
+    pytest.param("jsonl.zst", marks=pytest.mark.skipif(landing.zstandard is None, reason="needs zstandard")),
+    "jsonl.gz",
+]
+
+
+def details(movie_id: int, with_credits: bool):
+    record = fake_details(movie_id)
+    if with_credits:
+        record["credits"] = fake_credits(movie_id)
+    return record
+
+
+def land(tmp_path, file_format, endpoint, records):
+    zone = LandingZone(str(tmp_path), run_id="run", file_format=file_format)
+    zone.append(endpoint, records)
+    zone.close()
+    return list(zone.iter_records([endpoint]))
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_round_trip(tmp_path, file_format):
+    records = [fake_movie(movie_id) for movie_id in range(1, 101)]
+    
+    assert land(tmp_path, file_format, "popular", records) == records
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_keys_missing_from_first_record_are_kept(tmp_path, file_format):
+    # Only later payloads carry credits (and an optional field)
+    records = [details(movie_id, with_credits=movie_id > 1) for movie_id in range(1, 11)]
+    records[-1]["homepage"] = "https://example.com"
+    
+    assert land(tmp_path, file_format, "details", records) == records
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_field_types_varying_between_records(tmp_path, file_format):
+    records = [{"id": 1, "runtime": 90}, {"id": 2, "runtime": "unknown"}]
+    
+    assert land(tmp_path, file_format, "details", records) == records
+
+
+def test_latest_by_id_keeps_the_last_landed_version(tmp_path):
+    zone = LandingZone(str(tmp_path), run_id="run", file_format="jsonl.gz", rows_per_file=2)
+    zone.append("details", [{"id": 1, "runtime": 90}, {"id": 2, "runtime": 100}])
+    zone.append("details", [{"id": 1, "runtime": 95}])
+    zone.close()
+    
+    assert zone.latest_by_id(["details"]) == [{"id": 1, "runtime": 95}, {"id": 2, "runtime": 100}]
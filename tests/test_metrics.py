@@ -0,0 +1,55 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from monitoring.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.configure(profile="all", trace_memory=True)
+    yield registry
+    registry.reset()
+    tracemalloc.stop()
+
+
+def run_in_thread(func):
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+def test_main_thread_stages_are_profiled_and_traced(registry):
+    with registry.stage("transform"):
+        data = [bytes(1000) for _ in range(1000)]
+    del data
+    
+    assert "transform" in registry.profiles
+    assert registry.report()["stages"]["transform"]["memory_peak_bytes"] >= 1000 * 1000
+
+
+def test_worker_thread_stages_are_only_timed(registry):
+    def stage():
+        with registry.stage("store", rows=10):
+            [bytes(1000) for _ in range(1000)]
+    
+    run_in_thread(stage)
+    
+    stats = registry.report()["stages"]["store"]
+    assert (stats["calls"], stats["rows"]) == (1, 10)
+    assert "memory_peak_bytes" not in stats
+    assert "store" not in registry.profiles
+
+
+def test_worker_allocations_count_towards_the_enclosing_main_stage(registry):
+    def stage():
+        with registry.stage("store"):
+            data = [bytes(1000) for _ in range(2000)]
+            del data
+    
+    with registry.stage("pipeline.run"):
+        run_in_thread(stage)
+    
+    assert registry.report()["stages"]["pipeline.run"]["memory_peak_bytes"] >= 2000 * 1000
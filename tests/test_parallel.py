@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from benchmarks.stub_server import GENRES, fake_movie
+from processor import parallel
+from processor.enricher import DataEnricher
+from processor.parallel import ParallelTransformer
+from processor.transformer import DataTransformer
+
+
+@pytest.fixture(scope="module")
+def raw_movies():
+    return [fake_movie(movie_id) for movie_id in range(1, 2001)]
+
+
+def test_worker_count_is_capped_at_the_cpus(monkeypatch, capsys):
+    monkeypatch.setattr(parallel, "_available_cpus", lambda: 2)
+    
+    assert ParallelTransformer(8).workers == 2
+    assert "8 requested, but only 2 CPU(s) available" in capsys.readouterr().out
+    assert ParallelTransformer(2).workers == 2
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("shape", ["records", "columns"])
+def test_pool_matches_the_single_process_chain(monkeypatch, raw_movies, shape):
+    monkeypatch.setattr(parallel, "_available_cpus", lambda: 2)
+    movies = raw_movies if shape == "records" else {
+        field: [movie.get(field) for movie in raw_movies] for field in DataTransformer.RAW_FIELDS}
+    
+    expected = DataEnricher().enrich(DataTransformer().process_movies(raw_movies, GENRES), genres=GENRES)
+    actual = ParallelTransformer(2, enrich=True).process_movies(movies, GENRES)
+    
+    pd.testing.assert_frame_equal(expected, actual, check_exact=False, rtol=1e-6)
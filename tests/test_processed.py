@@ -0,0 +1,54 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from benchmarks.stub_server import GENRES
+from main import main
+from storage import processed
+from storage.processed import read_processed_movies, write_processed_movies
+
+FORMATS = [
+    "movies.pkl.gz",
+    pytest.param("movies.parquet", marks=pytest.mark.skipif(processed.pq is None, reason="needs pyarrow")),
+]
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_round_trip_keeps_genres(tmp_path, movies_df, name):
+    path = str(tmp_path / name)
+    write_processed_movies(movies_df, GENRES, path)
+    
+    read_df, genres = read_processed_movies(path)
+    
+    assert genres == GENRES
+    pd.testing.assert_frame_equal(read_df.drop(columns="genre_list"), movies_df.drop(columns="genre_list"))
+    assert [list(names) for names in read_df["genre_list"]] == movies_df["genre_list"].tolist()
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_load_stores_tmdb_genre_ids(tmp_path, monkeypatch, movies_df, name):
+    path = str(tmp_path / name)
+    db_path = str(tmp_path / "movies.db")
+    write_processed_movies(movies_df, GENRES, path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", db_path)
+    
+    assert main(["load", "--input", path]) == 0
+    
+    conn = sqlite3.connect(db_path)
+    assert sorted(conn.execute("SELECT id, name FROM genres")) == sorted((g["id"], g["name"]) for g in GENRES)
+    assert conn.execute("SELECT COUNT(*) FROM movie_genres").fetchone()[0] > 0
+    conn.close()
+
+
+def test_load_rejects_file_without_genres(tmp_path, monkeypatch, movies_df, capsys):
+    path = str(tmp_path / "movies.pkl")
+    movies_df.to_pickle(path)
+    db_path = tmp_path / "movies.db"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", str(db_path))
+    
+    assert main(["load", "--input", path]) == 1
+    assert "holds no genre list" in capsys.readouterr().out
+    assert not db_path.exists()
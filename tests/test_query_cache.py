@@ -0,0 +1,72 @@
+import contextlib
+import io
+import sqlite3
+
+import pytest
+
+from storage.db_connector import DatabaseConnector
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "query_cache.db")
+
+
+def test_create_tables_keeps_the_write_version(db_path):
+    with DatabaseConnector(db_path) as db:
+        before = db._read_write_version()
+        db.create_tables()
+        assert db._read_write_version() == before is not None
+
+
+def test_disk_cache_survives_a_new_run(db_path, cache_path):
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        expected = db.get_top_rated_rows(10)
+    
+    # What every CLI run does before reading
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        db.create_tables()
+        assert db.get_top_rated_rows(10) == expected
+        assert db.query_cache.stats["hits"] == 1
+
+
+def test_upsert_invalidates(db_path, cache_path, movies_df):
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        top = db.get_top_rated_movies(10)
+        updated = movies_df[movies_df["id"] == top["id"].iloc[-1]].assign(weighted_rating=99)
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.upsert_movies(updated)
+        
+        assert db.get_top_rated_movies(10)["id"].iloc[0] == top["id"].iloc[-1]
+    
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        assert db.get_top_rated_movies(10)["id"].iloc[0] == top["id"].iloc[-1]
+
+
+def test_outside_write_invalidates(db_path, cache_path):
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        before = db.query_rows("SELECT COUNT(*) FROM movies")[1]
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM movies WHERE id = 1")
+        conn.commit()
+        conn.close()
+        
+        assert db.query_rows("SELECT COUNT(*) FROM movies")[1] == [(before[0][0] - 1,)]
+
+
+def test_ad_hoc_sql_bypasses_the_cache(db_path, cache_path):
+    with DatabaseConnector(db_path, cache_path=cache_path) as db:
+        results = {db.query_rows("SELECT random()", cache=False)[1][0][0] for _ in range(5)}
+        
+        assert len(results) > 1
+        assert db.query_cache.stats["hits"] + db.query_cache.stats["misses"] == 0
+
+
+def test_missing_write_version_through_an_engine(tmp_path):
+    # A SQLAlchemy URL goes through the engine's DB-API driver and its own error types
+    path = tmp_path / "engine.db"
+    sqlite3.connect(path).close()
+    with DatabaseConnector(f"sqlite+pysqlite:///{path}") as db:
+        assert db._read_write_version() is None
+        db.create_tables()
+        assert db._read_write_version() is not None
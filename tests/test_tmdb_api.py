@@ -0,0 +1,62 @@
+import json
+
+import requests
+
+from scraper.cache import SQLiteResponseCache
+from scraper.tmdb_api import TMDBApi
+
+
+class FakeTransport:
+    """
+    Answers GETs from a queue of (status, payload) pairs, recording the headers sent
+    """
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+    
+    def get(self, url, params=None, headers=None, timeout=None, label=None):
+        self.sent_headers.append(dict(headers or {}))
+        status, payload = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        return response
+
+
+def make_api(responses):
+    api = TMDBApi("test-key", requests_per_second=None)
+    api.transport = FakeTransport(responses)
+    return api
+
+
+def test_304_without_a_cached_entry_is_refetched():
+    api = make_api([(304, None), (200, {"page": 1, "results": []})])
+    
+    assert api.get_popular_movies() == {"page": 1, "results": []}
+    assert api.transport.sent_headers == [{}, {}]
+    assert api.transport.responses == []
+
+
+def test_304_with_a_cached_entry_serves_it(tmp_path):
+    api = make_api([(304, None)])
+    api.cache = SQLiteResponseCache(str(tmp_path / "responses.db"))
+    try:
+        api.cache.set(api.cache.make_key("/movie/popular", {"page": 1}), "/movie/popular",
+                      {"page": 1}, etag='"v1"')
+        
+        assert api.get_popular_movies(revalidate=True) == {"page": 1}
+        assert api.transport.sent_headers == [{"If-None-Match": '"v1"'}]
+    finally:
+        api.cache.close()
+
+
+def test_304_after_eviction_is_refetched_and_cached(tmp_path):
+    api = make_api([(304, None), (200, {"page": 2})])
+    api.cache = SQLiteResponseCache(str(tmp_path / "responses.db"))
+    try:
+        # The server still answers 304 (e.g. a shared proxy), but nothing is cached here
+        assert api.get_popular_movies(page=2) == {"page": 2}
+        assert api.cache.get(api.cache.make_key("/movie/popular", {"page": 2})).payload == {"page": 2}
+    finally:
+        api.cache.close()
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from benchmarks.bench_transformer import assert_parity, make_raw_movies, process_movies_legacy
+from benchmarks.stub_server import GENRES, StubTMDBServer
+from monitoring.metrics import metrics
+from processor.transformer import DataTransformer
+from scraper.data_collector import MovieDataCollector
+
+
+@pytest.fixture(scope="module")
+def raw_movies():
+    # Includes invalid dates, unknown genres, details-shaped genres and missing fields
+    return make_raw_movies(2000)
+
+
+@pytest.mark.parametrize("shape", ["records", "columns", "frame"])
+def test_parity_with_the_per_movie_loop(raw_movies, shape):
+    if shape == "records":
+        movies = raw_movies
+    else:
+        movies = {field: [movie.get(field) for movie in raw_movies] for field in DataTransformer.RAW_FIELDS}
+        if shape == "frame":
+            movies = pd.DataFrame(movies)
+    
+    assert_parity(process_movies_legacy(raw_movies, GENRES), DataTransformer().process_movies(movies, GENRES))
+
+
+def test_collected_columns_match_records_and_count_rows():
+    metrics.reset()
+    with StubTMDBServer() as server:
+        collector = MovieDataCollector("test-key", workers=2, requests_per_second=None, base_url=server.base_url)
+        records = collector.get_popular_movies(pages=3)
+        columns = collector.get_popular_movie_columns(DataTransformer.RAW_FIELDS, pages=3)
+    
+    transformer = DataTransformer()
+    pd.testing.assert_frame_equal(transformer.process_movies(records, GENRES),
+                                  transformer.process_movies(columns, GENRES))
+    stage = metrics.report()["stages"]["collect.popular_movies"]
+    assert (stage["calls"], stage["rows"]) == (2, 120)